@@ -3,6 +3,8 @@
 # Copyright (C) Jordan Memphis Leef. All Rights Reserved.
 # View the LICENSE.md on GitHub
 
+from __future__ import annotations
+
 __all__ = ["__title__", "__version__", "__author__", "__license__", "__copyright__"]
 __title__ = "Word Battle Analytic Tool"
 __version__ = "1.1"
@@ -10,26 +12,69 @@ __author__ = "Jordan Memphis Leef"
 __license__ = "Freeware"
 __copyright__ = "Copyright (C) Jordan Memphis Leef"
 
-from typing import List, Dict, Tuple, Iterator, Generator, Any
+from contextlib import redirect_stdout, contextmanager
+from collections import Counter
+from typing import List, Dict, Set, Tuple, Iterator, Iterable, Sequence, Any, NamedTuple, Optional, Callable, BinaryIO
+from functools import lru_cache
 from colorama import Fore, Style
 from itertools import islice
-from math import ceil
-import matplotlib.patches as mpatches
-import matplotlib.pyplot as plt
+from array import array
+import concurrent.futures as futures
+import importlib.util
+import importlib
 import itertools as it
-import seaborn as sns
-import pandas as pd
-import numpy as np
 import subprocess
+import argparse
+import heapq
+import io
+import sqlite3
 import os.path
-import msvcrt
+import struct
+import mmap
+import warnings
+import tracemalloc
+import threading
+import atexit
 import ctypes
 import errno
+import re
 import json
+import csv
 import time
 import sys
 import ast
 
+
+class LazyModule:
+    """Stand in for a module until one of its attributes is first used, then import it and take its place in the globals."""
+    def __init__(self, name: str, alias: str) -> None:
+        self.name = name # The full name of the module
+        self.alias = alias # The global name the module is bound to
+
+    def __getattr__(self, attribute: str) -> Any:
+        with instrumentation.stage("import"):
+            module = importlib.import_module(self.name)
+
+        globals()[self.alias] = module
+        return getattr(module, attribute)
+
+
+# The numeric, plotting, dataframe and imaging libraries take most of the startup time, they are only imported by the options that use them
+np = LazyModule("numpy", "np")
+plt = LazyModule("matplotlib.pyplot", "plt")
+mpatches = LazyModule("matplotlib.patches", "mpatches")
+font_manager = LazyModule("matplotlib.font_manager", "font_manager")
+sns = LazyModule("seaborn", "sns")
+pd = LazyModule("pandas", "pd")
+Image = LazyModule("PIL.Image", "Image")
+ImageDraw = LazyModule("PIL.ImageDraw", "ImageDraw")
+ImageFont = LazyModule("PIL.ImageFont", "ImageFont")
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None # Only available on Windows, the interactive menus cannot run without it
+
 # Global constant declaration
 PY_VERSION = 3.8 # The Python version that the game is programmed on
 SW_MAXIMISE = 3 # Set the command prompt to open in maximized window
@@ -38,12 +83,77 @@ UPPER_LIMIT = 15 # The max board length
 COMPUTER_PLAYER_NAME = "Computer" # To distinguish itself from human players
 LOCAL_DIR_REPLAYS = "./Replays/" # The path to the "Replays" folder
 REPLAY_FILE_FORMAT = ".wbr" # The format for the replay files
+BINARY_REPLAY_FILE_FORMAT = ".wbrb" # The format for the compact binary replay files
+REPLAY_FILE_FORMATS = (REPLAY_FILE_FORMAT, BINARY_REPLAY_FILE_FORMAT) # Every format that can be analysed
+ARCHIVE_FILE_FORMAT = ".wbra" # The format for the archives of many replay files packed together
+ARCHIVE_MAGIC = b"WBRA" # The first bytes of every replay archive
+ARCHIVE_VERSION = 1 # The version of the replay archive layout
+BINARY_REPLAY_MAGIC = b"WBRB" # The first bytes of every binary replay file
+BINARY_REPLAY_VERSION = 1 # The version of the binary replay layout
+REPLAY_INDEX_FILE = "replay_index.db" # The sidecar index of decoded replays stored within the "Replays" folder
+INGEST_WORKERS = os.cpu_count() or 1 # The number of processes used to decode replay files
+INGEST_CHUNK_SIZE = 64 # The number of replay files decoded by a process at a time
+HEADER_SCAN_BLOCK_SIZE = 4096 # The number of bytes read at a time while scanning the header and the players of a replay file
+TURN_TABLE_CHUNK_SIZE = 4096 # The number of games held in memory at a time by the streaming analytics
+REPLAY_ERRORS = (KeyError, ValueError, SyntaxError, OverflowError) # Raised when a replay file is corrupted or outdated
+REPLAY_CODEC = "utf-32-le" if sys.byteorder == "little" else "utf-32-be" # The codec matching the native layout of 32-bit integers
 LETTER_VALUE = {"A": 3, "B": 9, "C": 8, "D": 7, "E": 1, "F": 8, "G": 8, "H": 5, "I": 5, "J": 10, "K": 10, "L": 7, "M": 8, "N": 5, "O": 4, "P": 9, "Q": 10, "R": 6, "S": 5, "T": 2, "U": 8, "V": 10, "W": 8, "X": 10, "Y": 9, "Z": 10} # The strength of each letter
-
-def clear_screen(time_set=1) -> None:
+EVENTS = ["PLAYING", "WON", "DRAW", "RESIGNED"] # The events recorded by each turn, in the order of their event codes
+GAME_MODES = ["Human Vs Human", "Computer Vs Computer", "Human Vs Computer"] # The game mode of a game, given by the types of its players
+EVENT_CODES = {event: code for code, event in enumerate(EVENTS)} # The event code of each event
+SQUARE_OFFSETS = list(it.accumulate([0] + [length * length if LOWER_LIMIT <= length <= UPPER_LIMIT else 0 for length in range(UPPER_LIMIT + 1)])) # The start of the grid of each board size within the packed square counts
+TOP_K = 3 # The number of most frequent words and letters shown for each player
+MESSAGE_DELAY = float(os.environ.get("WBAT_MESSAGE_DELAY", 1)) # The seconds an error message stays on screen before it is cleared
+ANSI_HOME = "\x1b[H" # Move the cursor to the top left of the screen
+ANSI_MOVE = "\x1b[{};1H" # Move the cursor to the start of a line of the screen, counted from 1
+ANSI_CLEAR_LINE = "\x1b[K" # Clear the rest of the line after the cursor
+ANSI_CLEAR_BELOW = "\x1b[J" # Clear the rest of the screen after the cursor
+REPLAY_SNAPSHOT_INTERVAL = 16 # The number of turns between the board snapshots kept by the replay engine
+REPLAY_SKIP_TURNS = 10 # The number of turns skipped at a time when stepping through a replay
+LOCAL_DIR_FRAMES = "./Frames/" # The path to the folder the replay frames are exported to
+FRAME_FORMATS = {"text": ".txt", "ansi": ".ans", "png": ".png", "gif": ".gif"} # The file extension of each format the replay frames can be exported as
+EXPORT_CHUNK_SIZE = 8 # The number of replay files exported by a process at a time
+FRAME_FONT_SIZE = 16 # The font size of the PNG and GIF frames
+FRAME_BACKGROUND = (12, 12, 12) # The background colour of the PNG and GIF frames
+FRAME_SHADES = 16 # The number of shades from the background to each colour of the PNG and GIF frames, for the antialiased edges of the characters
+FRAME_COLOURS = {Fore.WHITE: (242, 242, 242), Fore.RED: (231, 72, 86), Fore.GREEN: (22, 198, 12), Fore.YELLOW: (249, 241, 165), Fore.CYAN: (97, 214, 214)} # The bright console colour of each foreground colour
+ANSI_ESCAPE = re.compile(r"(\x1b\[[0-9;]*[A-Za-z])") # An ANSI escape code, captured so splitting a line keeps the codes
+STARTUP_PROFILE_COUNT = 25 # The number of modules reported by --profile-startup
+PROFILE_VARIABLE = "WBAT_PROFILE" # Print the time spent in each stage of the analyses when the program exits if this environment variable is set
+TRACE_VARIABLE = "WBAT_TRACE" # Write the stages of the analyses as a Chrome trace to the file named by this environment variable
+SAMPLE_VARIABLE = "WBAT_SAMPLE" # Sample the call stack while each action runs and report the busiest functions if this environment variable is set
+SAMPLE_INTERVAL = 0.005 # The seconds between the samples of the call stack
+SAMPLE_TOP = 20 # The number of functions reported by the sampling profiler
+CONSOLE_OUTPUT_MODE = 0x0007 # Processed output, wrap at the end of a line and virtual terminal processing of ANSI escape codes
+
+def clear_screen() -> None:
     """Clear the screen."""
-    time.sleep(time_set)
-    os.system('cls')
+    sys.stdout.write(ANSI_HOME + ANSI_CLEAR_BELOW)
+    sys.stdout.flush()
+
+
+def redraw_screen(frame: str, previous: Optional[str] = None) -> None:
+    """Draw a frame over the previous one in place, without clearing the screen first. Only the lines that differ from the previous frame are written if it is given."""
+    if previous is None:
+        sys.stdout.write(ANSI_HOME + frame.replace("\n", ANSI_CLEAR_LINE + "\n") + ANSI_CLEAR_BELOW)
+    else:
+        lines = frame.split("\n")
+        previous_lines = previous.split("\n")
+        changes = [ANSI_MOVE.format(line_number + 1) + line + ANSI_CLEAR_LINE for line_number, line in enumerate(lines[:-1])
+                   if line_number >= len(previous_lines) or line != previous_lines[line_number]]
+
+        # The last line is always written so the cursor ends up after the frame and everything below it is cleared
+        sys.stdout.write("".join(changes) + ANSI_MOVE.format(len(lines)) + lines[-1] + ANSI_CLEAR_BELOW)
+
+    sys.stdout.flush()
+
+
+def pause(seconds: Optional[float] = None) -> None:
+    """Keep the screen as it is for a number of seconds, a message stays for MESSAGE_DELAY seconds by default."""
+    seconds = MESSAGE_DELAY if seconds is None else seconds
+
+    if seconds > 0:
+        time.sleep(seconds)
 
 
 def input_integer(label: str) -> int:
@@ -52,7 +162,7 @@ def input_integer(label: str) -> int:
         try:
             return int(input(label))
         except ValueError:
-            clear_screen(0)
+            clear_screen()
 
 
 def chunk(it, size) -> Iterator[tuple]:
@@ -69,7 +179,7 @@ def check_if_file_exists(file_name: str) -> None:
         f = open(file_name)
         f.close()
     except FileNotFoundError:
-        clear_screen(0)
+        clear_screen()
         print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
         print(Fore.RED + Style.BRIGHT + f"Error: File not found!\nPlease add the file {file_name} before continuing")
         print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
@@ -78,16 +188,38 @@ def check_if_file_exists(file_name: str) -> None:
 
 
 def calculate_word_strength(word: str) -> int:
-    """Calculate the strength of the word."""
-    total = 0
+    """Calculate the strength of the word, a character that is not a letter adds nothing to it. See calculate_word_strengths for many words."""
+    return int(calculate_word_strengths([word])[0][0])
 
-    try:
-        for letter in word:
-            total += LETTER_VALUE[letter]
-    except KeyError:
-        return 0
 
-    return total
+@lru_cache(maxsize=None)
+def get_strength_table() -> np.ndarray:
+    """The strength of the letter of every byte value. A byte that is not a letter counts 1 in the upper 32 bits instead, so a single sum totals both."""
+    table = np.full(256, 1 << 32, dtype=np.int64)
+
+    for letter, value in LETTER_VALUE.items():
+        table[ord(letter)] = value
+
+    return table
+
+
+def calculate_word_strengths(words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the strength of many words at once.
+
+    Return the strength of each word and whether it has a character that is not a letter, which adds nothing to its strength.
+    """
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    # Every word is packed into a single buffer of bytes that is looked up in one go, a character outside latin-1 becomes "?" so each character stays a byte
+    letters = np.frombuffer("".join(words).encode("latin-1", "replace"), dtype=np.uint8)
+    totals = np.zeros(len(letters) + 1, dtype=np.int64)
+    np.cumsum(get_strength_table()[letters], out=totals[1:])
+
+    # The sum of the letters of each word is the difference of the running totals at its ends, the upper 32 bits count the characters that are not letters
+    sums = totals[ends] - totals[starts]
+    return (sums & 0xFFFFFFFF).astype(np.int32), sums >> 32 > 0
 
 
 def calculate_frequency(lst: list) -> Dict[str, int]:
@@ -116,381 +248,1484 @@ def sort_dict_by_values(dct: dict) -> List[Tuple[str, int]]:
     return sorted(dct.items(), key=lambda x: x[1], reverse=True)
 
 
-def check_files() -> None:
-    """Open all the files to check their board size."""
-    # Do not run this on PyCharm due to the code msvcrt.getch() contained within this component
-    board_size_list = []
-    game_duration_list = []
-    players_info = []
-    filename_list = []
+class Stage:
+    """A stage of an analysis being timed. The count is the number of files, games or turns it processed."""
+    def __init__(self, instrumentation: Instrumentation, name: str) -> None:
+        self.instrumentation = instrumentation # The instrumentation the stage is recorded by
+        self.name = name # The name of the stage
+        self.count = 0 # The number of items processed
+        self.start = 0 # The wall clock time the stage started at in nanoseconds
+        self.cpu = 0 # The CPU time of the process the stage started at in nanoseconds
+        self.memory = 0 # The size of the traced allocations the stage started with
+        self.peak = 0 # The largest size of the traced allocations so far, including the stages within it
+
+    def __enter__(self) -> Stage:
+        stack = self.instrumentation.stack
+
+        # The peak of the stage around this one is kept before it is reset for this one
+        if tracemalloc.is_tracing():
+            self.memory, peak = tracemalloc.get_traced_memory()
+
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+        stack.append(self)
+        self.cpu = time.process_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        wall = time.perf_counter_ns() - self.start
+        cpu = time.process_time_ns() - self.cpu
+        stack = self.instrumentation.stack
+        stack.pop()
+
+        if tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+
+        self.instrumentation.records.append((self.name, self.start, wall, cpu, self.count, max(self.peak - self.memory, 0), len(stack)))
+
+
+class NullStage:
+    """Stand in for a stage while the instrumentation is switched off."""
+    count = 0 # Discarded
+
+    def __enter__(self) -> NullStage:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class SamplingProfiler:
+    """Sample the call stack of a thread from a thread of its own, counting the functions running and the functions calling them."""
+    def __init__(self, interval: float = SAMPLE_INTERVAL, thread_id: Optional[int] = None) -> None:
+        self.interval = interval # The seconds between the samples
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id # The thread being sampled
+        self.samples = 0 # The number of samples taken
+        self.own = Counter() # The number of samples each function was running in
+        self.total = Counter() # The number of samples each function was on the call stack in
+        self.stop_event = threading.Event() # Set to stop sampling
+        self.thread = threading.Thread(target=self.run, name="SamplingProfiler", daemon=True) # The thread taking the samples
+
+    def __enter__(self) -> SamplingProfiler:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop_event.set()
+        self.thread.join()
+
+    def run(self) -> None:
+        """Take a sample every interval until stopped."""
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+
+            if frame is None:
+                continue
+
+            functions = []
+
+            while frame is not None:
+                code = frame.f_code
+                functions.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+
+            self.samples += 1
+            self.own[functions[0]] += 1
+            self.total.update(set(functions))
+
+    def display(self, label: str, top: int = SAMPLE_TOP, file: Any = None) -> None:
+        """Display the functions that were running the most, with the share of the samples they were running in and on the call stack in."""
+        file = sys.stderr if file is None else file
+        print(Fore.WHITE + Style.BRIGHT + f"\n{label}: {self.samples} samples every {self.interval * 1000:g} ms", file=file)
+
+        if not self.samples:
+            return
+
+        print(f"{'Own %':>7} {'Total %':>8}  Function", file=file)
+
+        for function, count in self.own.most_common(top):
+            name, filename, line = function
+            print(f"{count / self.samples * 100:>7.1f} {self.total[function] / self.samples * 100:>8.1f}  {name} ({os.path.basename(filename)}:{line})", file=file)
+
+
+class Instrumentation:
+    """Time the stages of the analyses: listing, decoding, aggregating and rendering. Switched off unless enabled by an environment variable or a flag."""
+    def __init__(self) -> None:
+        self.summary = False # Whether a summary of the stages is displayed when the program exits
+        self.trace_path = None # The file the stages are written to as a Chrome trace when the program exits
+        self.sample = False # Whether each action is sampled by a sampling profiler
+        self.stack = [] # The stages running, innermost last
+        self.records = [] # The name, start, wall time, CPU time, count, allocation peak and depth of every finished stage
+        self.profiles = [] # The label and the sampling profiler of every sampled action
+        self.origin = time.perf_counter_ns() # The time the trace starts at
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the stages are being timed."""
+        return self.summary or self.trace_path is not None
+
+    def configure(self, summary: bool = False, trace_path: Optional[str] = None, sample: bool = False) -> None:
+        """Switch on the summary, the trace or the sampling profiler. The reports are written to the standard error when the program exits."""
+        switched_on = self.enabled or self.sample
+        self.summary = self.summary or summary
+        self.trace_path = trace_path or self.trace_path
+        self.sample = self.sample or sample
+
+        if not switched_on and (self.enabled or self.sample):
+            atexit.register(self.finish)
+
+        # Tracing the allocations slows everything down, so it only runs while the stages are timed
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def configure_from_environment(self) -> None:
+        """Switch on whatever the environment variables ask for."""
+        self.configure(bool(os.environ.get(PROFILE_VARIABLE)), os.environ.get(TRACE_VARIABLE) or None, bool(os.environ.get(SAMPLE_VARIABLE)))
+
+    def stage(self, name: str) -> Any:
+        """Time a stage in a with statement, a stage that does nothing is returned while switched off."""
+        return Stage(self, name) if self.enabled else NULL_STAGE
+
+    @contextmanager
+    def action(self, label: str) -> Iterator[None]:
+        """Run an action, such as a command or a menu option, as a stage of its own and sample it if the sampling profiler is switched on."""
+        with self.stage(label):
+            if not self.sample:
+                yield
+                return
+
+            profiler = SamplingProfiler()
+
+            # An action that ends in an exception, such as the exit option, still keeps its profile
+            try:
+                with profiler:
+                    yield
+            finally:
+                self.profiles.append((label, profiler))
+
+    def stage_summary(self) -> List[Dict[str, Any]]:
+        """Total the records of each stage. The own time leaves out the stages running within it."""
+        totals = {}
+        children = [0] * (max((depth for *_, depth in self.records), default=0) + 2)
+
+        # A stage finishes after every stage within it, so the wall time of the stages within each depth is carried up when it finishes
+        for name, _, wall, cpu, count, peak, depth in self.records:
+            total = totals.setdefault(name, {"stage": name, "calls": 0, "wall": 0, "own": 0, "cpu": 0, "count": 0, "peak": 0})
+            total["calls"] += 1
+            total["wall"] += wall
+            total["own"] += wall - children[depth + 1]
+            total["cpu"] += cpu
+            total["count"] += count
+            total["peak"] = max(total["peak"], peak)
+            children[depth + 1] = 0
+            children[depth] += wall
+
+        return sorted(totals.values(), key=lambda total: total["own"], reverse=True)
+
+    def display_summary(self, file: Any = None) -> None:
+        """Display the wall, own and CPU time, the number of items and the allocation peak of each stage."""
+        file = sys.stderr if file is None else file
+        print(Fore.WHITE + Style.BRIGHT + f"\n{'Stage':<16} {'Calls':>6} {'Wall (ms)':>10} {'Own (ms)':>10} {'CPU (ms)':>10} {'Items':>10} {'Peak (KB)':>10}", file=file)
+
+        for total in self.stage_summary():
+            print(f"{total['stage']:<16} {total['calls']:>6} {total['wall'] / 1e6:>10.1f} {total['own'] / 1e6:>10.1f} {total['cpu'] / 1e6:>10.1f} {total['count']:>10} {total['peak'] / 1024:>10.1f}", file=file)
+
+    def write_trace(self, path: str) -> None:
+        """Write every stage as a complete event of the Chrome trace event format, which chrome://tracing and Perfetto open."""
+        events = [{"name": name, "cat": "stage", "ph": "X", "ts": (start - self.origin) / 1000, "dur": wall / 1000, "pid": os.getpid(), "tid": 0,
+                   "args": {"cpu_ms": cpu / 1e6, "count": count, "peak_bytes": peak}}
+                  for name, start, wall, cpu, count, peak, _ in self.records]
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def finish(self) -> None:
+        """Display the summary and the sampled actions, and write the trace."""
+        if self.summary:
+            self.display_summary()
+
+        if self.trace_path is not None:
+            self.write_trace(self.trace_path)
+            print(Fore.WHITE + Style.BRIGHT + f"Trace of {len(self.records)} stages written to {self.trace_path}", file=sys.stderr)
+
+        for label, profiler in self.profiles:
+            profiler.display(label)
+
+
+NULL_STAGE = NullStage() # The stage returned while the instrumentation is switched off
+instrumentation = Instrumentation() # The stages timed by this process
+
+
+class Turn(NamedTuple):
+    """A single turn recorded within a replay."""
+    player_name: str # The name of the player
+    type: str # The type of the player, either "human" or "computer"
+    difficulty: Optional[str] # The difficulty of a computer player
+    event: str # The event of the turn (PLAYING, WON, DRAW or RESIGNED)
+    word: Optional[str] # The word placed down by the player
+    selected_path: Optional[List[Tuple[int, int]]] # The coordinates of the word placed down
+
+
+class Replay:
+    """Create a replay object from the contents of a replay file."""
+    def __init__(self, game_number: int, board_length: int, game_duration: Any, turns: List[Turn]) -> None:
+        self.game_number = game_number # The game number of the replay
+        self.board_length = board_length # The length of the board
+        self.game_duration = game_duration # Game Duration of the whole game
+        self.turns = turns # Every turn of the game in order
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Replay):
+            return NotImplemented
+
+        return (self.game_number, self.board_length, self.game_duration, self.turns) == (other.game_number, other.board_length, other.game_duration, other.turns)
+
+    @property
+    def players(self) -> List[Dict[str, Any]]:
+        """The players of the game in the order they first appear."""
+        players = {}
+
+        for turn in self.turns:
+            if turn.player_name not in players:
+                players[turn.player_name] = {"name": turn.player_name, "type": turn.type, "difficulty": turn.difficulty}
+
+        return list(players.values())
+
+
+def parse_code_points(raw: bytes) -> np.ndarray:
+    """Parse the whitespace separated decimal integers of a buffer in a single pass of numpy, without splitting it into strings."""
+    # numpy only warns when it meets something other than an integer, which is an error here
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+
+        try:
+            codes = np.fromstring(raw, dtype=np.int64, sep=" ")
+        except DeprecationWarning as e:
+            raise ValueError("Invalid character in replay file") from e
+
+    # A buffer of nothing but whitespace is read as a single 0
+    if codes.size == 1 and not raw.strip():
+        codes = codes[:0]
 
+    if codes.size and (codes.min() < 0 or codes.max() > 0x10FFFF):
+        raise ValueError("Code point out of range")
+
+    return codes.astype(np.uint32)
+
+
+def decode_replay_text(raw: Any) -> str:
+    """Convert the integer-per-line payload of a .wbr file into the text it represents."""
+    # Each line holds a single code point, so they are parsed into 32-bit integers and decoded in bulk
+    return parse_code_points(raw).tobytes().decode(REPLAY_CODEC)
+
+
+def parse_replay(data: list) -> Replay:
+    """Create a replay object from the decoded contents of a replay file."""
     try:
-        file_list = os.listdir(LOCAL_DIR_REPLAYS)
-        filename_list += file_list
+        header = data[0]
 
-        if len(file_list) == 0:
-            clear_screen(0)
-            print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
-            print(Fore.RED + Style.BRIGHT + "Error: No files detected!")
-            print(Fore.WHITE + Style.BRIGHT + "Press any key to return to main menu.")
-            msvcrt.getch()
-            main()
+        if not (header['game_number'] > 0 and header['board_length'] > 0):
+            raise ValueError("Invalid game number or board length")
 
-        # Open every .wbr file within the 'Replays' folder
-        for file in file_list:
-            file = file[:-4]  # Remove the file extension
+        turns = [Turn(turn['player_name'], turn['type'], turn['difficulty'], turn['event'], turn['word'],
+                      None if turn['selected_path'] is None else [tuple(coord) for coord in turn['selected_path']])
+                 for turn in data[1:]]
+    except (TypeError, IndexError) as e:
+        raise ValueError("Unexpected replay structure") from e
 
-            if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
-                try:
-                    with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                        bytes_data = f.read().splitlines()
-                        data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                        wbr_content = {"wbr_game_info": data}
-                        replay_info = json.dumps(wbr_content, indent=7)
-                        replay_info = json.loads(replay_info)
-
-                        if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0]['board_length'] > 0:
-                            board_size_list.append(replay_info['wbr_game_info'][0]['board_length'])
-                            game_duration_list.append(replay_info['wbr_game_info'][0]['game_duration'])
-                            player_list = []
-                            player_info = []
-
-                            for player in replay_info['wbr_game_info'][1:]:
-                                player_dict = {}
-
-                                if player['player_name'] not in player_list:
-                                    player_dict['player_name'] = player['player_name']
-                                    player_dict['type'] = player['type']
-                                    player_list.append(player['player_name'])
-                                    player_info.append(player_dict)
-
-                            players_info.append(player_info)
-                        else:
-                            board_size_list.append(None)
-                            game_duration_list.append(None)
-                            players_info.append(None)
-                except (KeyError, ValueError, SyntaxError, OverflowError):
-                    board_size_list.append(None)
-                    game_duration_list.append(None)
-                    players_info.append(None)
-            else:
-                board_size_list.append(None)
-                game_duration_list.append(None)
-                players_info.append(None)
+    return Replay(header['game_number'], header['board_length'], header['game_duration'], turns)
 
-        clear_screen(0)
 
-        while True:
-            board_size = input_integer("Board Size (Type 0 to go back to main menu): ")
+def decode_replay(raw: bytes) -> Replay:
+    """Decode the raw contents of a .wbr file."""
+    return parse_replay(ast.literal_eval(decode_replay_text(raw)))
 
-            if board_size == 0:
-                main()
-            elif board_size < LOWER_LIMIT or board_size > UPPER_LIMIT:
-                clear_screen(0)
-                print(Fore.WHITE + Style.BRIGHT + "Board Size (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "Invalid board size!")
-                print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
-                msvcrt.getch()
-                clear_screen(0)
-            else:
-                clear_screen(0)
-                print(f"Board Size Required: {board_size}\n{len(board_size_list)} files have been checked.\n")
-                type_collection = []
-                game_mode_list = []
-
-                for player in players_info:
-                    type_list = []
-
-                    try:
-                        for key in player:
-                            type_list.append(key['type'])
-                    except TypeError:
-                        type_list.append(None)
-
-                    type_collection.append(type_list)
-
-                for type_list in type_collection:
-                    if "human" not in type_list:
-                        game_mode_list.append("Computer Vs Computer")
-                    elif "computer" not in type_list:
-                        game_mode_list.append("Human Vs Human")
-                    elif None in type_list:
-                            game_mode_list.append(None)
-                    else:
-                        game_mode_list.append("Human Vs Computer")
 
-                warning = False
+def encode_replay(replay: Replay) -> bytes:
+    """Encode a replay into the contents of a .wbr file, the code point of each character of the list literal on a line of its own."""
+    data = [{"game_number": replay.game_number, "board_length": replay.board_length, "game_duration": replay.game_duration}] + [turn._asdict() for turn in replay.turns]
+    return "\n".join(map(str, np.frombuffer(repr(data).encode(REPLAY_CODEC), dtype=np.uint32).tolist())).encode()
 
-                for i in range(len(board_size_list)):
-                    if board_size_list[i] is None or len(players_info[i]) == 0 or game_mode_list[i] is None:
-                        warning = True
-                        print(Fore.YELLOW + Style.BRIGHT + f"{filename_list[i]} | Board Size: Indeterminate | Number of Players: Indeterminate | Game Mode: Indeterminate | Game Duration: Indeterminate")
-                    else:
-                        if board_size_list[i] == board_size:
-                            print(Fore.GREEN + Style.BRIGHT + f"{filename_list[i]} | Board Size: {board_size_list[i]} | Number of Players: {len(players_info[i])} | Game Mode: {game_mode_list[i]} | Game Duration: {game_duration_list[i]}")
-                        else:
-                            print(Fore.WHITE + Style.BRIGHT + f"{filename_list[i]} | Board Size: {board_size_list[i]} | Number of Players: {len(players_info[i])} | Game Mode: {game_mode_list[i]} | Game Duration: {game_duration_list[i]}")
 
-                if warning:
-                    print(Fore.YELLOW + Style.BRIGHT + "\nWarning: Multiple files either have incorrect file extension, is corrupted or outdated.\r")
+def pack_value(value: Any) -> bytes:
+    """Pack a header or player field into a tagged binary value."""
+    if value is None:
+        return b"\x00"
+    elif type(value) is int and -2 ** 63 <= value < 2 ** 63:
+        return b"\x01" + struct.pack("<q", value)
+    elif type(value) is float:
+        return b"\x02" + struct.pack("<d", value)
+    elif type(value) is str:
+        return b"\x03" + pack_string(value, "<H")
+    else:
+        # Anything else is stored as the Python literal it was written as
+        return b"\x04" + pack_string(repr(value), "<H")
 
-                print(Fore.GREEN + Style.BRIGHT + "\nProcess Complete!")
-                print(Fore.WHITE + Style.BRIGHT + "Press any key to return to main menu.")
-                msvcrt.getch()
-                main()
-    except FileNotFoundError:
-        clear_screen(0)
-        print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
-        print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
 
-        # Create the folder if it does not exist
+def pack_string(value: str, length_format: str) -> bytes:
+    """Pack a string prefixed by its encoded length. Raises ValueError if it is too long for the length to fit."""
+    encoded = value.encode()
+
+    if len(encoded) >= 256 ** struct.calcsize(length_format):
+        raise ValueError("String too long to be packed")
+
+    return struct.pack(length_format, len(encoded)) + encoded
+
+
+def unpack_string(data: memoryview, offset: int, length_format: str) -> Tuple[str, int]:
+    """Unpack a string prefixed by its encoded length. Return the string and the offset after it.
+
+    Raises IndexError if the string runs past the end of the data, before any of it is decoded.
+    """
+    length = struct.unpack_from(length_format, data, offset)[0]
+    offset += struct.calcsize(length_format)
+
+    if offset + length > len(data):
+        raise IndexError("String past the end of the data")
+
+    return bytes(data[offset:offset + length]).decode(), offset + length
+
+
+def unpack_value(data: memoryview, offset: int) -> Tuple[Any, int]:
+    """Unpack a tagged binary value. Return the value and the offset after it."""
+    tag = data[offset]
+    offset += 1
+
+    if tag == 0:
+        return None, offset
+    elif tag == 1:
+        return struct.unpack_from("<q", data, offset)[0], offset + 8
+    elif tag == 2:
+        return struct.unpack_from("<d", data, offset)[0], offset + 8
+    elif tag in (3, 4):
+        value, offset = unpack_string(data, offset, "<H")
+        return (value if tag == 3 else ast.literal_eval(value)), offset
+    else:
+        raise ValueError(f"Unknown value tag {tag}")
+
+
+def encode_binary_replay(replay: Replay) -> bytes:
+    """Encode a replay into the compact binary replay format.
+
+    Layout (little-endian):
+        header: magic, version (B), game number (I), board length (B), game duration (tagged value)
+        players: count (H), then name (H-prefixed), type (B-prefixed) and difficulty (tagged value) of each player
+        events: count (B), then each event name (B-prefixed)
+        turns: count (I), then per turn a fixed-width record of event code (B), player id (H), word length (B)
+               and path length (B) followed by the word and one byte per coordinate packed as row << 4 | column
+    A length of 255 marks a word or path of None. Raises ValueError if a field does not fit its layout.
+    """
+    if not 0 < replay.board_length <= 16:
+        raise ValueError("Only board lengths from 1 to 16 can be packed")
+    elif not 0 <= replay.game_number < 2 ** 32:
+        raise ValueError("Game number out of range to be packed")
+
+    players = {}
+    events = {}
+    turns = []
+
+    for turn in replay.turns:
+        player_id = players.setdefault((turn.player_name, turn.type, turn.difficulty), len(players))
+        event_code = events.setdefault(turn.event, len(events))
+        word = b"" if turn.word is None else turn.word.encode()
+        path = b"" if turn.selected_path is None else bytes((x << 4) | y for x, y in turn.selected_path)
+
+        if len(word) >= 255 or len(path) >= 255:
+            raise ValueError("Word or path too long to be packed")
+        elif len(players) > 0xFFFF or len(events) > 0xFF:
+            raise ValueError("Too many players or events to be packed")
+
+        turns.append(struct.pack("<BHBB", event_code, player_id, 255 if turn.word is None else len(word), 255 if turn.selected_path is None else len(path)) + word + path)
+
+    parts = [BINARY_REPLAY_MAGIC, struct.pack("<BIB", BINARY_REPLAY_VERSION, replay.game_number, replay.board_length), pack_value(replay.game_duration)]
+    parts.append(struct.pack("<H", len(players)))
+
+    for player_name, player_type, difficulty in players:
+        parts += [pack_string(player_name, "<H"), pack_string(player_type, "<B"), pack_value(difficulty)]
+
+    parts.append(struct.pack("<B", len(events)))
+    parts += [pack_string(event, "<B") for event in events]
+    parts.append(struct.pack("<I", len(turns)))
+    parts += turns
+    return b"".join(parts)
+
+
+def unpack_binary_header(data: memoryview) -> Tuple[int, int, Any, List[Tuple[str, str, Any]], int]:
+    """Unpack the header and the player table of a .wbrb file. Return the game number, board length, game duration, players and the offset after them.
+
+    Raises struct.error or IndexError if the data ends before the player table does.
+    """
+    magic, version, game_number, board_length = struct.unpack_from("<4sBIB", data)
+
+    if magic != BINARY_REPLAY_MAGIC:
+        raise ValueError("Not a binary replay file")
+    elif version != BINARY_REPLAY_VERSION:
+        raise ValueError(f"Unsupported binary replay version {version}")
+
+    game_duration, offset = unpack_value(data, 10)
+    player_count = struct.unpack_from("<H", data, offset)[0]
+    offset += 2
+    players = []
+
+    for _ in range(player_count):
+        player_name, offset = unpack_string(data, offset, "<H")
+        player_type, offset = unpack_string(data, offset, "<B")
+        difficulty, offset = unpack_value(data, offset)
+        players.append((player_name, player_type, difficulty))
+
+    return game_number, board_length, game_duration, players, offset
+
+
+def decode_binary_replay(raw: bytes) -> Replay:
+    """Decode the raw contents of a .wbrb file."""
+    data = memoryview(raw)
+
+    try:
+        game_number, board_length, game_duration, players, offset = unpack_binary_header(data)
+        event_count = data[offset]
+        offset += 1
+        events = []
+
+        for _ in range(event_count):
+            event, offset = unpack_string(data, offset, "<B")
+            events.append(event)
+
+        turn_count = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+        turns = []
+
+        for _ in range(turn_count):
+            event_code, player_id, word_length, path_length = struct.unpack_from("<BHBB", data, offset)
+            offset += 5
+            word = None
+            path = None
+
+            if word_length != 255:
+                word = bytes(data[offset:offset + word_length]).decode()
+                offset += word_length
+
+            if path_length != 255:
+                path = [(coord >> 4, coord & 15) for coord in data[offset:offset + path_length]]
+                offset += path_length
+
+            turns.append(Turn(*players[player_id], events[event_code], word, path))
+    except (struct.error, IndexError) as e:
+        raise ValueError("Truncated binary replay file") from e
+
+    if game_number <= 0 or board_length <= 0:
+        raise ValueError("Invalid game number or board length")
+
+    return Replay(game_number, board_length, game_duration, turns)
+
+
+class ReplayHeader(NamedTuple):
+    """The header and the players of a replay, enough to summarise it without decoding every turn."""
+    game_number: int # The game number of the replay
+    board_length: int # The length of the board
+    game_duration: Any # Game Duration of the whole game
+    players: List[Tuple[str, str]] # The name and type of each player in the order they first appear
+
+
+def iter_literal_elements(blocks: Iterable[str]) -> Iterator[str]:
+    """Split the text of a list literal, given a block at a time, into the text of each element without reading past the element wanted."""
+    depth = 0 # The nesting of brackets, braces and parentheses, the elements of the list are at depth 2
+    quote = None # The quote of the string being read
+    escaped = False # Whether the previous character was a backslash within a string
+    pending = None # The text of the element from the previous blocks, None between elements
+
+    for block in blocks:
+        start = None if pending is None else 0
+
+        for index, character in enumerate(block):
+            if quote is not None:
+                if escaped:
+                    escaped = False
+                elif character == "\\":
+                    escaped = True
+                elif character == quote:
+                    quote = None
+            elif character in "'\"":
+                quote = character
+            elif character in "[{(":
+                depth += 1
+
+                if depth == 2:
+                    start = index
+                    pending = ""
+            elif character in "]})":
+                depth -= 1
+
+                if depth == 1:
+                    yield pending + block[start:index + 1]
+                    start = None
+                    pending = None
+                elif depth == 0:
+                    return
+
+        if pending is not None:
+            pending += block[start:]
+
+
+def iter_replay_text(f: BinaryIO, block_size: int = HEADER_SCAN_BLOCK_SIZE) -> Iterator[str]:
+    """Decode an open .wbr file a block at a time, each block ends on a whole line."""
+    remainder = b""
+
+    while True:
+        block = f.read(block_size)
+
+        if not block:
+            if remainder.strip():
+                yield decode_replay_text(remainder)
+
+            return
+
+        block = remainder + block
+        end = block.rfind(b"\n") + 1
+        remainder = block[end:]
+        yield decode_replay_text(block[:end])
+
+
+def scan_replay_text(blocks: Iterable[str]) -> ReplayHeader:
+    """Read the header and the players of a replay from its text, stopping at the first turn of the first player to play again."""
+    try:
+        elements = iter_literal_elements(blocks)
+        header = ast.literal_eval(next(elements))
+
+        if not (header['game_number'] > 0 and header['board_length'] > 0):
+            raise ValueError("Invalid game number or board length")
+
+        # The players take their turns in order, so every player has played once the first one is back
+        players = {}
+
+        for element in elements:
+            turn = ast.literal_eval(element)
+
+            if turn['player_name'] in players and turn['player_name'] == next(iter(players)):
+                break
+
+            players.setdefault(turn['player_name'], turn['type'])
+    except (TypeError, IndexError, StopIteration) as e:
+        raise ValueError("Unexpected replay structure") from e
+
+    return ReplayHeader(header['game_number'], header['board_length'], header['game_duration'], list(players.items()))
+
+
+def scan_binary_replay(f: BinaryIO, block_size: int = HEADER_SCAN_BLOCK_SIZE) -> ReplayHeader:
+    """Read the header and the player table of an open .wbrb file, without reading its turns."""
+    raw = f.read(block_size)
+
+    # Every read checks the length it needs first, so a value cut off by the end of the block only asks for more of the file
+    while True:
         try:
-            os.makedirs('Replays')
-        except OSError as e:
-            if e.errno != errno.EEXIST:
-                raise
+            game_number, board_length, game_duration, players, _ = unpack_binary_header(memoryview(raw))
+            break
+        except (struct.error, IndexError) as e:
+            block = f.read(len(raw))
 
-        print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
-        msvcrt.getch()
-        clear_screen(0)
+            if not block:
+                raise ValueError("Truncated binary replay file") from e
 
+            raw += block
 
-def display_player_statistics() -> None:
-    """Display the player's statistics."""
-    def get_player_word_dict(players: list, grouping=0) -> dict:
-        """Create a dict of players with their word lists."""
-        players_dict = { i : [] for i in player_list}
-
-        for player in players:
-            if player[0] in players_dict:
-                players_dict[player[0]].append(player[1])
-
-        if grouping != 0:
-            for player in players_dict.values():
-                players_dict = list(chunk(player, grouping))
-
-        return players_dict
-
-    def calculate_most_frequent_words(word_list: list) -> List[str]:
-        """Calculate the most frequent words for a player."""
-        most_frequent = []
-        length = 3
-        word_frequency = calculate_frequency(word_list)
-
-        if len(word_list) >= length:
-            while len(most_frequent) < length:
-                letter = max(word_frequency, key=word_frequency.get)
-                most_frequent.append(letter)
-                del word_frequency[letter]
-        else:
-            return word_list
+    if game_number <= 0 or board_length <= 0:
+        raise ValueError("Invalid game number or board length")
 
-        return most_frequent
+    # The player table holds a player once for each difficulty they played at
+    roster = {}
 
-    def calculate_most_frequent_letters(word_list: list) -> List[str]:
-        """Calculate the most frequent letters for a player."""
-        letter_list = []
-        most_frequent = []
-        length = 3
+    for player_name, player_type, _ in players:
+        roster.setdefault(player_name, player_type)
 
-        for word in word_list:
-            letter_list += list(word)
+    return ReplayHeader(game_number, board_length, game_duration, list(roster.items()))
 
-        letter_frequency = calculate_frequency(letter_list)
 
-        while len(most_frequent) < length:
-            letter = max(letter_frequency, key=letter_frequency.get)
-            most_frequent.append(letter)
-            del letter_frequency[letter]
+class ReplayArchive:
+    """Open a replay archive (.wbra) of many replay files as a single memory map.
 
-        return most_frequent
+    Layout (little-endian):
+        header: magic, version (B), member count (I), offset of the member table (Q)
+        members: the contents of each replay file as they were, one after another
+        member table: the offset (Q), length (I) and file name (H-prefixed) of each member
+    """
+    HEADER = struct.Struct("<4sBIQ")
+    MEMBER = struct.Struct("<QIH")
 
-    def calculate_avg_word_strength(word_collection: list, game_length: int):
-        """Calculate the avg word strength for a player."""
-        highest_avg = 0
+    def __init__(self, path: str) -> None:
+        self.path = path # The path to the archive
+        self.members = {} # The offset and length of each replay file within the archive by its file name
 
-        for word_list in word_collection:
-            total = 0
+        with open(path, "rb") as f:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # The archive mapped into memory, every member is read through it
+            except ValueError as e:
+                raise ValueError("Empty replay archive") from e
 
-            for word in word_list:
-                total += calculate_word_strength(word)
+        try:
+            magic, version, count, offset = self.HEADER.unpack_from(self.map, 0)
 
-            avg = int(total / game_length)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError("Not a replay archive")
+            elif version != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported replay archive version {version}")
 
-            if avg >= highest_avg:
-                highest_avg = avg
+            for _ in range(count):
+                member_offset, length, name_length = self.MEMBER.unpack_from(self.map, offset)
+                offset += self.MEMBER.size
+                self.members[self.map[offset:offset + name_length].decode()] = (member_offset, length)
+                offset += name_length
 
-        return highest_avg
+                if member_offset + length > len(self.map):
+                    raise ValueError("Member past the end of the replay archive")
+        except (struct.error, ValueError) as e:
+            self.map.close()
+            raise ValueError("Corrupted replay archive") from e
 
-    def calculate_total_games(outcomes: dict) -> int:
-        """Calculate the total games for a player."""
-        return sum(outcomes.values())
+    def __enter__(self) -> ReplayArchive:
+        return self
 
-    def calculate_win_rate(wins: int, total_games: int) -> float:
-        """Calculate the win rate for a player."""
-        win_rate = round(wins / total_games * 100, 2)
-        return win_rate
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    def display_data() -> None:
-        """Display data."""
-        title = "Player Statistics"
-        player_word_dict = get_player_word_dict(players_words)
-
-        for player in player_events:
-            if player[0] in players:
-                if player[1] == 'RESIGNED':
-                    players[player[0]]['LOSES'] += 1
-                elif player[1] == 'DRAW':
-                    players[player[0]]['DRAWS'] += 1
-                elif player[1] == 'WON':
-                    players[player[0]]['WINS'] += 1
-            else:
-                if player[1] == 'RESIGNED':
-                    players[player[0]]['LOSES'] = 1
-                elif player[1] == 'DRAW':
-                    players[player[0]]['DRAWS'] = 1
-                elif player[1] == 'WON':
-                    players[player[0]]['WINS'] = 1
-
-        clear_screen(0)
-        print(f"{title}\n{'-' * len(title)}\r")
+    def close(self) -> None:
+        """Unmap the archive."""
+        self.map.close()
 
-        for player in player_info:
-            word_list = player_word_dict[player[0]]
-            split_number = ceil(game_length[player_info.index(player)] / 2)
-            total_turns = get_player_word_dict(players_words, split_number)
-            total_games_played = calculate_total_games(players[player[0]])
-
-            if player[2] is None:
-                print(f"\n{player[0]}\nWINS: {players[player[0]]['WINS']} LOSES: {players[player[0]]['LOSES']} DRAWS: {players[player[0]]['DRAWS']}")
-                print(f"Total Games Played: {total_games_played}\nWin Rate: {calculate_win_rate(players[player[0]]['WINS'], total_games_played)}%")
-
-                if word_list:
-                    most_frequent_word = calculate_most_frequent_words(word_list)
-                    most_frequent_letters = calculate_most_frequent_letters(word_list)
-                    print(f"Most Frequent Words: {', '.join(most_frequent_word)}\nMost Frequent Letters: {', '.join(most_frequent_letters)}")
-                    print("Avg Word Strength Per Turn:", calculate_avg_word_strength(total_turns, total_games_played))
-                else:
-                    print(f"Most Frequent Words: 0\nMost Frequent Letters: 0")
-            else:
-                print(f"\n{player[0]} ({player[2]}) - {player[1].capitalize()}\nWINS: {players[player[0]]['WINS']} LOSES: {players[player[0]]['LOSES']} DRAWS: {players[player[0]]['DRAWS']}")
-                print(f"Total Games Played: {total_games_played}\nWin Rate: {calculate_win_rate(players[player[0]]['WINS'], total_games_played)}%")
+    def read(self, name: str) -> bytes:
+        """Read the contents of a member, only its own pages of the archive are touched."""
+        offset, length = self.members[name]
+        return self.map[offset:offset + length]
 
-                if word_list:
-                    most_frequent_word = calculate_most_frequent_words(word_list)
-                    most_frequent_letters = calculate_most_frequent_letters(word_list)
-                    print(f"Most Frequent Words: {', '.join(most_frequent_word)}\nMost Frequent Letters: {', '.join(most_frequent_letters)}")
-                    print("Avg Word Strength Per Turn:", calculate_avg_word_strength(total_turns, total_games_played))
 
-                else:
-                    print(f"Most Frequent Words: 0\nMost Frequent Letters: 0")
+def pack_replay_archive(directory: str, output_path: str) -> int:
+    """Pack every replay file within a folder into a replay archive. Return the number of files packed. Raises ValueError if the archive would be written into the folder being packed."""
+    # An archive within the folder is read alongside the files it holds, so every game would be counted twice
+    if os.path.realpath(os.path.dirname(os.path.abspath(output_path))) == os.path.realpath(directory):
+        raise ValueError(f"The archive cannot be written into {directory}, the folder being packed!")
 
-        print(Fore.WHITE + Style.BRIGHT + "\nPress any key to continue...")
-        msvcrt.getch()
-        main()
+    files = sorted(file for file in os.listdir(directory) if file.endswith(REPLAY_FILE_FORMATS))
+    table = []
+
+    # The member table is written last so the members can be copied in one pass, the header is then written again with its offset
+    with open(output_path, "wb") as f:
+        f.write(ReplayArchive.HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(files), 0))
+
+        for file in files:
+            with open(os.path.join(directory, file), "rb") as replay_file:
+                raw = replay_file.read()
+
+            name = file.encode()
+            table.append(ReplayArchive.MEMBER.pack(f.tell(), len(raw), len(name)) + name)
+            f.write(raw)
+
+        table_offset = f.tell()
+        f.write(b"".join(table))
+        f.seek(0)
+        f.write(ReplayArchive.HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(files), table_offset))
+
+    return len(files)
+
+
+@lru_cache(maxsize=4)
+def get_replay_archive(path: str, size: int, mtime: int) -> ReplayArchive:
+    """Open a replay archive, it stays open while its size and modification time are unchanged."""
+    return ReplayArchive(path)
+
+
+def open_replay_archive(path: str) -> ReplayArchive:
+    """Open a replay archive once per process rather than once per member. Raises OSError or ValueError if it cannot be opened."""
+    stat = os.stat(path)
+    return get_replay_archive(path, stat.st_size, stat.st_mtime_ns)
 
-    board_size_list = []
-    player_list = []
-    player_info = []
-    player_events = []
-    players_words = []
-    game_length = []
+
+def split_archive_path(file_path: str) -> Tuple[Optional[str], str]:
+    """Split the path of a replay file packed into an archive, given as the archive path followed by a slash and its file name, into the archive path and the file name. The archive path is None for any other file."""
+    archive, separator, name = file_path.partition(ARCHIVE_FILE_FORMAT + "/")
+    return (archive + ARCHIVE_FILE_FORMAT, name) if separator else (None, file_path)
+
+
+def replay_file_exists(file_path: str) -> bool:
+    """Check whether a replay file exists, on its own or packed into an archive."""
+    archive, name = split_archive_path(file_path)
+
+    if archive is None:
+        return os.path.isfile(file_path)
 
     try:
-        file_list = os.listdir(LOCAL_DIR_REPLAYS)
+        return name in open_replay_archive(archive).members
+    except (OSError, ValueError):
+        return False
 
-        if len(file_list) == 0:
-            clear_screen(0)
-            print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
-            print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder is empty!")
-            print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
-            msvcrt.getch()
-            clear_screen(0)
-        else:
-            # Open every .wbr file within the 'Replays' folder
-            for file in file_list:
-                file = file[:-4]  # Remove the file extension
-
-                if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
-                    try:
-                        with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                            bytes_data = f.read().splitlines()
-                            data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                            wbr_content = {"wbr_game_info": data}
-                            replay_info = json.dumps(wbr_content, indent=7)
-                            replay_info = json.loads(replay_info)
-
-                            if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0]['board_length'] > 0:
-                                board_size_list.append(replay_info['wbr_game_info'][0]['board_length'])
-                                replay_info['wbr_game_info'].pop(0)
-
-                                for player in replay_info['wbr_game_info']:
-
-                                    if player['player_name'] not in player_list:
-                                        player_list.append(player['player_name'])
-                                        player_info.append([player['player_name'], player['type'], player['difficulty']])
-                                        game_length.append(len(replay_info['wbr_game_info']) - 1)
-
-                                    player_events.append([player['player_name'], player['event']])
-
-                                    if player['word'] is not None:
-                                        players_words.append([player['player_name'], player['word']])
-
-                                players = {stats: {'WINS': 0, 'DRAWS': 0, 'LOSES': 0} for stats in player_list}
-                            else:
-                                pass
-                    except (KeyError, ValueError, SyntaxError, OverflowError):
-                        pass
+
+def read_replay_file(file_path: str) -> bytes:
+    """Read the contents of a replay file, on its own or packed into an archive."""
+    archive, name = split_archive_path(file_path)
+
+    if archive is not None:
+        return open_replay_archive(archive).read(name)
+
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def scan_replay_header(file_path: str) -> ReplayHeader:
+    """Open a .wbr or .wbrb file and read only its header and players. Raises one of REPLAY_ERRORS if they cannot be read."""
+    archive, name = split_archive_path(file_path)
+
+    # A packed file is already mapped into memory, so it is read from there in the same blocks
+    with open(file_path, "rb") if archive is None else io.BytesIO(open_replay_archive(archive).read(name)) as f:
+        if file_path.endswith(BINARY_REPLAY_FILE_FORMAT):
+            return scan_binary_replay(f)
+
+        return scan_replay_text(iter_replay_text(f))
+
+
+def load_replay(file_path: str) -> Replay:
+    """Open a .wbr or .wbrb file, on its own or packed into an archive, and decode it. Raises one of REPLAY_ERRORS if the file is corrupted or outdated."""
+    raw = read_replay_file(file_path)
+
+    if file_path.endswith(BINARY_REPLAY_FILE_FORMAT):
+        return decode_binary_replay(raw)
+
+    return decode_replay(raw)
+
+
+class IngestReport:
+    """Create a report of the replay files decoded during ingestion."""
+    def __init__(self) -> None:
+        self.decoded = 0 # The number of files decoded
+        self.failures = {} # The corrupted or outdated files, grouped by the process id of the worker which decoded them
+        self.indexed = [] # The corrupted or outdated files found by an earlier run, read from the replay index
+
+    @property
+    def failed(self) -> int:
+        """The number of files that could not be decoded."""
+        return sum(len(files) for files in self.failures.values()) + len(self.indexed)
+
+    def display(self, file: Any = None) -> None:
+        """Display the files that could not be decoded by each worker and those found by an earlier run, on the standard output unless another file is given."""
+        for worker, files in sorted(self.failures.items()):
+            print(Fore.YELLOW + Style.BRIGHT + f"Worker {worker}: {len(files)} corrupted or outdated file(s): {', '.join(sorted(files))}", file=file)
+
+        if self.indexed:
+            print(Fore.YELLOW + Style.BRIGHT + f"Replay index: {len(self.indexed)} corrupted or outdated file(s): {', '.join(sorted(self.indexed))}", file=file)
+
+
+def decode_replay_batch(directory: str, files: List[str], loader: Callable[[str], Any] = load_replay) -> Tuple[int, List[Tuple[str, Optional[Replay]]]]:
+    """Decode a batch of replay files, or only read what the loader given reads. Corrupted or outdated files are returned as None."""
+    replays = []
+
+    for file in files:
+        try:
+            replays.append((file, loader(os.path.join(directory, file))))
+        except REPLAY_ERRORS:
+            replays.append((file, None))
+
+    return os.getpid(), replays
+
+
+def ingest_replays(directory: str, files: List[str], report: IngestReport, workers: int = INGEST_WORKERS, chunk_size: int = INGEST_CHUNK_SIZE,
+                   loader: Callable[[str], Any] = load_replay) -> Iterator[Tuple[str, Optional[Replay]]]:
+    """Decode replay files in batches across a pool of processes, yielding them in the order given. scan_replay_header can be given as the loader to only read the headers."""
+    batches = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+    # Starting the pool costs more than it saves for a single batch
+    if workers <= 1 or len(batches) <= 1:
+        results = map(decode_replay_batch, it.repeat(directory), batches, it.repeat(loader))
+        executor = None
+    else:
+        executor = futures.ProcessPoolExecutor(max_workers=min(workers, len(batches)))
+        results = executor.map(decode_replay_batch, it.repeat(directory), batches, it.repeat(loader))
+
+    try:
+        for worker, replays in results:
+            for file, replay in replays:
+                if replay is None:
+                    report.failures.setdefault(worker, []).append(file)
                 else:
+                    report.decoded += 1
+
+                yield file, replay
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def list_replay_files(directory: str = LOCAL_DIR_REPLAYS) -> List[str]:
+    """List the files within the 'Replays' folder, excluding the replay index. The files packed into an archive are listed as if they were in a folder named after it."""
+    with instrumentation.stage("listdir") as stage:
+        files = []
+
+        for file in os.listdir(directory):
+            if file.startswith(REPLAY_INDEX_FILE):
+                continue
+            elif file.endswith(ARCHIVE_FILE_FORMAT):
+                try:
+                    files += [f"{file}/{name}" for name in open_replay_archive(os.path.join(directory, file)).members]
+                    continue
+                except (OSError, ValueError):
                     pass
 
-            difference = False
-            temp_num = None
+            files.append(file)
 
-            for i in board_size_list:
-                if (i >= LOWER_LIMIT or i <= UPPER_LIMIT) and temp_num is None:
-                    temp_num = i
-                else:
-                    if i != temp_num and not difference:
-                        difference = True
-                        clear_screen(0)
-                        print(Fore.YELLOW + Style.BRIGHT + "Warning: Multiple files are containing different board sizes. Are you sure you want to continue?")
-                        user_input = input(Fore.WHITE + Style.BRIGHT + "Y / N: ").upper()
+        stage.count = len(files)
+        return files
 
-                        if user_input == "":
-                            display_letter_frequency_bar_graph()
-                        elif user_input == "Y":
-                            display_data()
-                        elif user_input == "N":
-                            main()
-                        else:
-                            display_letter_frequency_bar_graph()
 
-            if not difference:
-                display_data()
-    except FileNotFoundError:
-        clear_screen(0)
-        print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
-        print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
+def convert_replays(directory: str = LOCAL_DIR_REPLAYS, output_directory: Optional[str] = None, workers: int = INGEST_WORKERS) -> IngestReport:
+    """Convert every .wbr file within a folder into a .wbrb file.
+
+    Converting within the same folder replaces each .wbr file once its conversion has been verified.
+    """
+    output_directory = directory if output_directory is None else output_directory
+    in_place = os.path.abspath(output_directory) == os.path.abspath(directory)
+    files = [file for file in list_replay_files(directory) if file.endswith(REPLAY_FILE_FORMAT) and split_archive_path(file)[0] is None]
+    report = IngestReport()
+    os.makedirs(output_directory, exist_ok=True)
+
+    for file, replay in ingest_replays(directory, files, report, workers):
+        if replay is None:
+            continue
 
-        # Create the folder if it does not exist
         try:
-            os.makedirs('Replays')
-        except OSError as e:
-            if e.errno != errno.EEXIST:
-                raise
+            raw = encode_binary_replay(replay)
 
-        print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
-        msvcrt.getch()
-        clear_screen(0)
+            if decode_binary_replay(raw) != replay:
+                raise ValueError("Lossy conversion")
+        except ValueError:
+            # The original file is left untouched if it cannot be converted losslessly
+            report.decoded -= 1
+            report.failures.setdefault(os.getpid(), []).append(file)
+            continue
 
+        with open(os.path.join(output_directory, file[:-len(REPLAY_FILE_FORMAT)] + BINARY_REPLAY_FILE_FORMAT), "wb") as f:
+            f.write(raw)
 
-def display_letter_frequency_bar_graph() -> None:
-    """Generate a bar graph for letter frequency and display it."""
-    def display_plot() -> None:
-        """Display plot."""
-        # The data to work with
-        letter_frequency = calculate_frequency(letter_list)
+        if in_place:
+            os.remove(os.path.join(directory, file))
+
+    return report
+
+
+def most_frequent(counts: Counter, k: int = TOP_K) -> List[str]:
+    """Find the k most frequent items in O(n log k) time, however many share the k-th count. Ties go to the item that sorts first."""
+    if k <= 0:
+        return []
+
+    return [item for item, count in heapq.nsmallest(k, counts.items(), key=lambda pair: (-pair[1], pair[0])) if count > 0]
+
+
+class PlayerAggregate:
+    """Accumulate the outcomes and the words of a single player over any number of games."""
+    def __init__(self, player_name: str, player_type: str, difficulty: Any, first_seen: Optional[Tuple[str, int]]) -> None:
+        self.player_name = player_name # The name of the player
+        self.type = player_type # The type of the player, taken from their first turn
+        self.difficulty = difficulty # The difficulty of the player, taken from their first turn
+        self.first_seen = first_seen # The file and turn number the player first appears at, None once that game is removed until the first game left is found
+        self.games = 0 # The number of games the player took part in
+        self.events = Counter() # The number of turns ending with each event
+        self.words = Counter() # The number of times each word was placed down
+        self.letters = Counter() # The number of times each letter was placed down
+        self.words_placed = 0 # The number of words placed down
+
+    def add_turn(self, turn: Turn, sign: int = 1) -> None:
+        """Add a turn to the aggregate, or remove it again with a sign of -1."""
+        self.events[turn.event] += sign
+
+        if turn.word:
+            self.words[turn.word] += sign
+            self.words_placed += sign
+
+            if sign > 0:
+                self.letters.update(turn.word)
+            else:
+                self.letters.subtract(turn.word)
+
+    def add_game(self, file: str, turn_no: int, player_type: str, difficulty: Any, sign: int = 1) -> None:
+        """Add the first turn of the player within a game, or remove the game again with a sign of -1."""
+        self.games += sign
+
+        if sign > 0:
+            if self.first_seen is None or (file, turn_no) < self.first_seen:
+                self.type, self.difficulty, self.first_seen = player_type, difficulty, (file, turn_no)
+        elif self.first_seen is not None and file == self.first_seen[0]:
+            # The aggregate does not hold the other games, the replay index looks up the first of the games left
+            self.first_seen = None
+
+    def merge(self, other: "PlayerAggregate") -> None:
+        """Add the games of another aggregate of the same player."""
+        if other.first_seen < self.first_seen:
+            self.type, self.difficulty, self.first_seen = other.type, other.difficulty, other.first_seen
+
+        self.games += other.games
+        self.events.update(other.events)
+        self.words.update(other.words)
+        self.letters.update(other.letters)
+        self.words_placed += other.words_placed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the aggregate into a dictionary that can be stored as JSON."""
+        return {"player_name": self.player_name, "type": self.type, "difficulty": self.difficulty, "first_seen": list(self.first_seen),
+                "games": self.games,
+                "events": +self.events, "words": +self.words, "letters": +self.letters, "words_placed": self.words_placed}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlayerAggregate":
+        """Rebuild an aggregate from the dictionary made by to_dict."""
+        aggregate = cls(data["player_name"], data["type"], data["difficulty"], tuple(data["first_seen"]))
+        aggregate.games = data["games"]
+        aggregate.events.update(data["events"])
+        aggregate.words.update(data["words"])
+        aggregate.letters.update(data["letters"])
+        aggregate.words_placed = data["words_placed"]
+        return aggregate
+
+    def statistics(self, k: int = TOP_K) -> Dict[str, Any]:
+        """Calculate the statistics of the player with their k most frequent words and letters."""
+        wins = self.events["WON"]
+        draws = self.events["DRAW"]
+        loses = self.events["RESIGNED"]
+        total_games = wins + draws + loses
+
+        # Each distinct word is scored once, weighted by the number of times it was placed down
+        words = [word for word, count in self.words.items() if count > 0]
+        counts = np.fromiter((self.words[word] for word in words), dtype=np.int64, count=len(words))
+        strengths, invalid = calculate_word_strengths(words)
+        strength = int(strengths @ counts)
+        return {"player_name": self.player_name, "type": self.type, "difficulty": self.difficulty,
+                "wins": wins, "draws": draws, "loses": loses, "total_games": total_games,
+                "win_rate": round(wins / total_games * 100, 2) if total_games else 0.0,
+                "most_frequent_words": most_frequent(self.words, k),
+                "most_frequent_letters": most_frequent(self.letters, k),
+                "avg_word_strength": strength // self.words_placed if self.words_placed > 0 else 0,
+                "invalid_words": int(counts[invalid].sum())}
+
+
+class PlayerStatistics:
+    """Create a mergeable collection of player aggregates, one per player name."""
+    def __init__(self) -> None:
+        self.players = {} # The aggregate of each player keyed by their name
+
+    def add_replay(self, file: str, replay: Replay, sign: int = 1) -> None:
+        """Add every turn of a replay, or remove them again with a sign of -1. A player whose first game is removed is left without a first_seen."""
+        seen = set()
+
+        for turn_no, turn in enumerate(replay.turns):
+            aggregate = self.players.get(turn.player_name)
+
+            # Games can be added and removed in any order, the type and difficulty are taken from the first turn by file name
+            if aggregate is None:
+                aggregate = self.players[turn.player_name] = PlayerAggregate(turn.player_name, turn.type, turn.difficulty, (file, turn_no))
+
+            if turn.player_name not in seen:
+                seen.add(turn.player_name)
+                aggregate.add_game(file, turn_no, turn.type, turn.difficulty, sign)
+
+            aggregate.add_turn(turn, sign)
+
+        # A player whose every game has been removed is dropped
+        if sign < 0:
+            for player_name in seen:
+                if not self.players[player_name].games:
+                    del self.players[player_name]
+
+    def merge(self, other: "PlayerStatistics") -> "PlayerStatistics":
+        """Add the aggregates of another collection, such as another shard of the corpus."""
+        for player_name, aggregate in other.players.items():
+            if player_name in self.players:
+                self.players[player_name].merge(aggregate)
+            else:
+                self.players[player_name] = PlayerAggregate.from_dict(aggregate.to_dict())
+
+        return self
+
+    def to_json(self) -> str:
+        """Serialise the collection."""
+        return json.dumps([aggregate.to_dict() for aggregate in self.players.values()])
+
+    @classmethod
+    def from_json(cls, text: str) -> "PlayerStatistics":
+        """Rebuild a collection serialised by to_json."""
+        statistics = cls()
+        statistics.players = {data["player_name"]: PlayerAggregate.from_dict(data) for data in json.loads(text)}
+        return statistics
+
+    def statistics(self, k: int = TOP_K) -> List[Dict[str, Any]]:
+        """Calculate the statistics of every player in the order they first appear."""
+        return [aggregate.statistics(k) for aggregate in sorted(self.players.values(), key=lambda aggregate: aggregate.first_seen)]
+
+
+class ReplayIndex:
+    """Create a persistent index of the decoded replays within a folder."""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            file TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime INTEGER NOT NULL,
+            valid INTEGER NOT NULL,
+            game_number INTEGER,
+            board_length INTEGER,
+            game_duration TEXT,
+            game_mode TEXT,
+            number_of_players INTEGER,
+            roster TEXT,
+            decoded INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS games_by_board_length ON games (board_length);
+        CREATE INDEX IF NOT EXISTS games_by_game_mode ON games (game_mode, board_length);
+        CREATE TABLE IF NOT EXISTS turns (
+            file TEXT NOT NULL,
+            turn_no INTEGER NOT NULL,
+            player_name TEXT,
+            type TEXT,
+            difficulty TEXT,
+            event TEXT,
+            word TEXT,
+            selected_path TEXT,
+            PRIMARY KEY (file, turn_no)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS player_games (
+            board_length INTEGER NOT NULL,
+            player_name TEXT NOT NULL,
+            file TEXT NOT NULL,
+            turn_no INTEGER NOT NULL,
+            type TEXT,
+            difficulty TEXT,
+            PRIMARY KEY (board_length, player_name, file)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS player_statistics (
+            board_length INTEGER NOT NULL,
+            player_name TEXT NOT NULL,
+            aggregate TEXT NOT NULL,
+            PRIMARY KEY (board_length, player_name)
+        ) WITHOUT ROWID;
+    """
+
+    VERSION = 4 # The version of the schema, an index of another version is rebuilt
+
+    def __init__(self, directory: str = LOCAL_DIR_REPLAYS) -> None:
+        self.directory = directory # The folder containing the replay files
+        self.connection = sqlite3.connect(os.path.join(directory, REPLAY_INDEX_FILE)) # The connection to the sidecar index
+
+        # The index only caches the replay files, so an index made by another version is emptied and every file is decoded again
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.connection.executescript("DROP TABLE IF EXISTS games; DROP TABLE IF EXISTS turns; DROP TABLE IF EXISTS player_games; DROP TABLE IF EXISTS player_statistics;")
+            self.connection.execute(f"PRAGMA user_version = {self.VERSION}")
+
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "ReplayIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the index."""
+        self.connection.close()
+
+    def scan(self, headers_only: bool = False) -> Tuple[List[str], List[Tuple[str, int, int]]]:
+        """Find the indexed files that no longer exist, and the size and modification time of the replay files that are new or have changed since they were indexed.
+
+        A file that only had its header read counts as changed too, unless only the headers are needed.
+        """
+        with instrumentation.stage("scan") as stage:
+            indexed = {file: (size, mtime) if decoded or headers_only else None
+                       for file, size, mtime, decoded in self.connection.execute("SELECT file, size, mtime, decoded FROM games")}
+            stale = []
+
+            files = []
+
+            # The size and modification time are read from the directory listing itself to avoid a stat call per file
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(REPLAY_FILE_FORMATS) and entry.is_file():
+                        stat = entry.stat()
+                        files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+                    elif entry.name.endswith(ARCHIVE_FILE_FORMAT) and entry.is_file():
+                        # The files packed into an archive take its modification time
+                        stat = entry.stat()
+
+                        try:
+                            files += [(f"{entry.name}/{name}", length, stat.st_mtime_ns) for name, (_, length) in open_replay_archive(entry.path).members.items()]
+                        except ValueError:
+                            pass
+
+            for file, size, mtime in files:
+                if indexed.pop(file, None) != (size, mtime):
+                    stale.append((file, size, mtime))
+
+            stage.count = len(files)
+            return list(indexed), stale
+
+    def update(self, workers: int = INGEST_WORKERS, chunk_size: int = INGEST_CHUNK_SIZE, report: Optional[IngestReport] = None) -> IngestReport:
+        """Decode every replay file that is new or has changed since it was indexed. The files decoded, and the files indexed as corrupted or outdated, are added to the report given, or to a new one."""
+        indexed, stale = self.scan()
+        removed = [(file,) for file in indexed] + [(file,) for file, _, _ in stale]
+        stats = {file: (size, mtime) for file, size, mtime in stale}
+        report = IngestReport() if report is None else report
+        shards = {} # The aggregates of the players of the games removed and added, keyed by board length
+        loaded = set() # The board length and name of every player whose aggregate has been read from the index
+
+        # The player statistics are kept up to date by removing the games being replaced here and adding the new ones below, only the players of those games are read and written
+        replaced = list(self.replays([file for file, in removed]))
+
+        for file, replay in replaced:
+            self.player_aggregates(shards, loaded, replay).add_replay(file, replay, -1)
+
+        with self.connection, instrumentation.stage("decode") as stage:
+            stage.count = len(stats)
+            self.connection.executemany("DELETE FROM games WHERE file = ?", removed)
+            self.connection.executemany("DELETE FROM turns WHERE file = ?", removed)
+            self.connection.executemany("DELETE FROM player_games WHERE board_length = ? AND player_name = ? AND file = ?",
+                                        [(replay.board_length, player["name"], file) for file, replay in replaced for player in replay.players])
+
+            # The players whose first game was removed take their type and difficulty from the first of their games left
+            for board_length, statistics in shards.items():
+                for player_name, aggregate in statistics.players.items():
+                    if aggregate.first_seen is None:
+                        file, turn_no, aggregate.type, aggregate.difficulty = self.connection.execute(
+                            "SELECT file, turn_no, type, difficulty FROM player_games WHERE board_length = ? AND player_name = ? ORDER BY file LIMIT 1", (board_length, player_name)).fetchone()
+                        aggregate.first_seen = (file, turn_no)
+
+            for file, replay in ingest_replays(self.directory, list(stats), report, workers, chunk_size):
+                self.insert(file, *stats[file], replay)
+
+                if replay is not None:
+                    self.player_aggregates(shards, loaded, replay).add_replay(file, replay)
+
+            self.connection.executemany("INSERT OR REPLACE INTO player_statistics VALUES (?, ?, ?)",
+                                        [(board_length, player_name, json.dumps(aggregate.to_dict())) for board_length, statistics in shards.items()
+                                         for player_name, aggregate in statistics.players.items()])
+
+            # A player whose every game has been removed is dropped from the index too
+            self.connection.executemany("DELETE FROM player_statistics WHERE board_length = ? AND player_name = ?",
+                                        [(board_length, player_name) for board_length, player_name in loaded if player_name not in shards[board_length].players])
+
+        self.report_failures(report)
+        return report
+
+    def player_aggregates(self, shards: Dict[int, PlayerStatistics], loaded: Set[Tuple[int, str]], replay: Replay) -> PlayerStatistics:
+        """The aggregates of the board length of a replay, after reading those of its players from the index the first time each is needed."""
+        statistics = shards.setdefault(replay.board_length, PlayerStatistics())
+
+        for player in replay.players:
+            if (replay.board_length, player["name"]) not in loaded:
+                loaded.add((replay.board_length, player["name"]))
+                row = self.connection.execute("SELECT aggregate FROM player_statistics WHERE board_length = ? AND player_name = ?", (replay.board_length, player["name"])).fetchone()
+
+                if row is not None:
+                    statistics.players[player["name"]] = PlayerAggregate.from_dict(json.loads(row[0]))
+
+        return statistics
+
+    def report_failures(self, report: IngestReport, removed: Iterable[str] = ()) -> None:
+        """Add the files indexed as corrupted or outdated to the report, other than those already in it and those given as removed since they were indexed."""
+        # A file is only decoded the first time it is seen, so the files found by earlier runs are reported from the index
+        reported = {file for files in report.failures.values() for file in files}.union(report.indexed, removed)
+        report.indexed += [file for file, in self.connection.execute("SELECT file FROM games WHERE NOT valid") if file not in reported]
+
+    def insert(self, file: str, size: int, mtime: int, replay: Optional[Replay]) -> None:
+        """Store a decoded replay, or None if the file is corrupted or outdated."""
+        if replay is None:
+            self.connection.execute("INSERT INTO games (file, size, mtime, valid, decoded) VALUES (?, ?, ?, 0, 1)", (file, size, mtime))
+            return
+
+        # The players and the game mode are worked out once here, rather than every time the files are checked
+        roster = [(player["name"], player["type"]) for player in replay.players]
+        self.connection.execute("INSERT INTO games VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, 1)", (file, size, mtime, replay.game_number, replay.board_length, repr(replay.game_duration),
+                                                                                         get_game_mode(player_type for _, player_type in roster), len(roster), json.dumps(roster)))
+        self.connection.executemany("INSERT INTO turns VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                    [(file, turn_no, turn.player_name, turn.type, turn.difficulty, turn.event, turn.word,
+                                      None if turn.selected_path is None else json.dumps(turn.selected_path))
+                                     for turn_no, turn in enumerate(replay.turns)])
+
+        # The first turn of each player is kept, so the first game of a player can be found again once another is removed
+        first_turns = {}
+
+        for turn_no, turn in enumerate(replay.turns):
+            first_turns.setdefault(turn.player_name, (turn_no, turn.type, turn.difficulty))
+
+        self.connection.executemany("INSERT INTO player_games VALUES (?, ?, ?, ?, ?, ?)",
+                                    [(replay.board_length, player_name, file, *first_turn) for player_name, first_turn in first_turns.items()])
+
+    def insert_headers(self, headers: List[Tuple[str, int, int, Optional[ReplayHeader]]]) -> None:
+        """Store the header and players read from replay files, or None if a file is corrupted or outdated. Each file is decoded in full by the next update.
+
+        A file that has been decoded before keeps its row, as the games it held are needed to update the player statistics.
+        """
+        with self.connection:
+            self.connection.executemany("DELETE FROM games WHERE file = ? AND NOT decoded", [(file,) for file, _, _, _ in headers])
+            self.connection.executemany("INSERT OR IGNORE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                                        [(file, size, mtime, 0, None, None, None, None, None, None) if header is None else
+                                         (file, size, mtime, 1, header.game_number, header.board_length, repr(header.game_duration),
+                                          get_game_mode(player_type for _, player_type in header.players), len(header.players), json.dumps(header.players))
+                                         for file, size, mtime, header in headers])
+
+    def headers(self) -> Dict[str, Tuple[int, int, Any]]:
+        """The game number, board length and game duration of every valid replay."""
+        return {file: (game_number, board_length, ast.literal_eval(game_duration))
+                for file, game_number, board_length, game_duration
+                in self.connection.execute("SELECT file, game_number, board_length, game_duration FROM games WHERE valid")}
+
+    def summaries(self, board_length: Optional[int] = None, game_mode: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """The board size, number of players, game mode and game duration of every valid replay with players, or only those of a board length and a game mode."""
+        conditions = "".join(f" AND {column} = ?" for column, value in (("board_length", board_length), ("game_mode", game_mode)) if value is not None)
+        parameters = [value for value in (board_length, game_mode) if value is not None]
+
+        # The conditions are answered by the indexes on the board length and the game mode, so only the matching games are read
+        return {file: {"file": file, "board_size": board_size, "number_of_players": number_of_players, "game_mode": mode, "game_duration": ast.literal_eval(game_duration)}
+                for file, board_size, number_of_players, mode, game_duration
+                in self.connection.execute(f"SELECT file, board_length, number_of_players, game_mode, game_duration FROM games WHERE valid AND game_mode IS NOT NULL{conditions}", parameters)}
+
+    def player_statistics(self) -> Dict[int, PlayerStatistics]:
+        """The player statistics of the games of each board length."""
+        shards = {}
+
+        for board_length, player_name, aggregate in self.connection.execute("SELECT board_length, player_name, aggregate FROM player_statistics ORDER BY board_length, player_name"):
+            shards.setdefault(board_length, PlayerStatistics()).players[player_name] = PlayerAggregate.from_dict(json.loads(aggregate))
+
+        return shards
+
+    def replays(self, files: Optional[List[str]] = None, board_length: Optional[int] = None) -> Iterator[Tuple[str, Replay]]:
+        """Rebuild every valid replay from the index, or only those of the files given or of a board length, ordered by file name."""
+        query = """
+            SELECT games.file, game_number, board_length, game_duration, turn_no, player_name, type, difficulty, event, word, selected_path
+            FROM games LEFT JOIN turns ON turns.file = games.file
+            WHERE valid AND decoded{}
+            ORDER BY games.file, turn_no
+        """
+
+        if files is None and board_length is not None:
+            rows = self.connection.execute(query.format(" AND board_length = ?"), (board_length,))
+        elif files is None:
+            rows = self.connection.execute(query.format(""))
+        else:
+            rows = it.chain.from_iterable(self.connection.execute(query.format(" AND games.file = ?"), (file,)) for file in sorted(files))
+
+        # The games share the single copy of each word kept by the vocabulary
+        vocabulary = get_vocabulary()
+
+        for file, group in it.groupby(rows, key=lambda row: row[0]):
+            first = next(group)
+            turns = [Turn(*row[5:9], vocabulary.intern(row[9]), None if row[10] is None else [tuple(coord) for coord in json.loads(row[10])])
+                     for row in it.chain((first,), group) if row[4] is not None]
+            yield file, Replay(first[1], first[2], ast.literal_eval(first[3]), turns)
+
+
+def group_offsets(lengths: np.ndarray) -> np.ndarray:
+    """Number the items of consecutive groups of the given lengths from zero, e.g. [2, 3] gives [0, 1, 0, 1, 2]."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    return np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+
+class Vocabulary:
+    """Intern every distinct word once and number it, so the turns of every game refer to their words by an integer id."""
+    def __init__(self) -> None:
+        self.ids = {} # The id of each word
+        self.words = [] # The word of each id
+        self.lengths = np.zeros(0, dtype=np.int16) # The length of the word of each id
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def intern(self, word: Optional[str]) -> Optional[str]:
+        """The single copy of a word kept by the vocabulary, numbering it the first time it is seen."""
+        if word is None:
+            return None
+
+        word_id = self.ids.get(word)
+
+        if word_id is None:
+            word_id = self.ids[word] = len(self.words)
+            self.words.append(word)
+
+        return self.words[word_id]
+
+    def encode(self, words: Iterable[Optional[str]]) -> np.ndarray:
+        """Number the words, a missing word is -1. The length of each new word is calculated once."""
+        ids = self.ids
+        codes = array('i')
+
+        for word in words:
+            word_id = -1 if word is None else ids.get(word)
+
+            if word_id is None:
+                word_id = ids[word] = len(self.words)
+                self.words.append(word)
+
+            codes.append(word_id)
+
+        # The words interned since the last call are measured together
+        new_words = self.words[len(self.lengths):]
+
+        if new_words:
+            self.lengths = np.concatenate((self.lengths, np.fromiter(map(len, new_words), dtype=np.int16, count=len(new_words))))
+
+        return np.frombuffer(codes, dtype=codes.typecode)
+
+    def add_counts(self, totals: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Add how often each word id occurs within codes to the totals of each id, missing words are left out."""
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.words))
+        return np.pad(totals, (0, len(counts) - len(totals))) + counts
+
+    def count_letters(self, counts: np.ndarray) -> Dict[str, int]:
+        """Count every letter of the words, each distinct word is split once and weighted by its count."""
+        used = np.flatnonzero(counts)
+        letters, owners = explode_letters(self, used)
+        unique, inverse = np.unique(letters, return_inverse=True)
+        totals = np.bincount(inverse, weights=counts[used][owners], minlength=len(unique)).astype(np.int64)
+        return {chr(letter): total for letter, total in zip(unique.tolist(), totals.tolist()) if total > 0}
+
+    def count_lengths(self, counts: np.ndarray) -> Dict[int, int]:
+        """Count every word length of the words, weighted by the count of each word."""
+        totals = np.bincount(self.lengths, weights=counts, minlength=1).astype(np.int64)
+        return {length: total for length, total in enumerate(totals.tolist()) if length > 0 and total > 0}
+
+
+@lru_cache(maxsize=None)
+def get_vocabulary() -> Vocabulary:
+    """Get the vocabulary shared by every turn table of this process, it is created the first time a word is interned."""
+    return Vocabulary()
+
+
+class TurnTable:
+    """Create a columnar table of every turn within a collection of replays."""
+    def __init__(self, games: pd.DataFrame, players: pd.DataFrame, turns: pd.DataFrame) -> None:
+        self.games = games # One row per game: file, game_number, board_length, game_duration
+        self.players = players # One row per player, indexed by player id: player_name, type, difficulty
+        self.turns = turns # One row per turn: game_id, turn_no, player_id, event, word_id, word_length and the path start, step and length
+
+    @classmethod
+    def from_replays(cls, replays: Iterable[Tuple[str, Replay]]) -> "TurnTable":
+        """Build the table from pairs of file names and replays."""
+        with instrumentation.stage("turn table") as stage:
+            games = {"file": [], "game_number": [], "board_length": [], "game_duration": []}
+            players = {"player_name": [], "type": [], "difficulty": []}
+            player_ids = {}
+            words = []
+            columns = {"game_id": array('i'), "turn_no": array('h'), "player_id": array('i'), "event": array('b'),
+                       "path_row": array('b'), "path_column": array('b'), "row_step": array('b'), "column_step": array('b'), "path_length": array('B')}
+
+            for game_id, (file, replay) in enumerate(replays):
+                games["file"].append(file)
+                games["game_number"].append(replay.game_number)
+                games["board_length"].append(replay.board_length)
+                games["game_duration"].append(replay.game_duration)
+
+                for turn_no, turn in enumerate(replay.turns):
+                    player_id = player_ids.get(turn.player_name)
+
+                    # Players are identified by their name, their type and difficulty are taken from their first turn
+                    if player_id is None:
+                        player_id = player_ids[turn.player_name] = len(player_ids)
+                        players["player_name"].append(turn.player_name)
+                        players["type"].append(turn.type)
+                        players["difficulty"].append(turn.difficulty)
+
+                    columns["game_id"].append(game_id)
+                    columns["turn_no"].append(turn_no)
+                    columns["player_id"].append(player_id)
+                    columns["event"].append(EVENT_CODES.get(turn.event, -1))
+                    words.append(turn.word)
+                    path = turn.selected_path
+
+                    # Every path is a straight line, so it is stored as its first coordinate and the step between coordinates
+                    if path:
+                        columns["path_row"].append(path[0][0])
+                        columns["path_column"].append(path[0][1])
+                        columns["row_step"].append(path[1][0] - path[0][0] if len(path) > 1 else 0)
+                        columns["column_step"].append(path[1][1] - path[0][1] if len(path) > 1 else 0)
+                        columns["path_length"].append(len(path))
+                    else:
+                        for column in ("path_row", "path_column", "row_step", "column_step", "path_length"):
+                            columns[column].append(0)
+
+            stage.count = len(words)
+            turns = pd.DataFrame({column: np.frombuffer(values, dtype=values.typecode) for column, values in columns.items()})
+            vocabulary = get_vocabulary()
+            codes = vocabulary.encode(words)
+
+            # Word lengths are calculated once per distinct word by the vocabulary, the appended zero is picked by the id -1 of a missing word
+            turns["word_id"] = codes
+            turns["word_length"] = np.append(vocabulary.lengths, np.int16(0))[codes]
+            return cls(pd.DataFrame(games), pd.DataFrame(players, dtype=object), turns)
+
+
+def explode_letters(vocabulary: Vocabulary, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Split the words given by their ids in a vocabulary into letters.
+
+    Return the code point of every letter and the position within codes of the word it came from.
+    """
+    text = np.frombuffer("".join([vocabulary.words[code] for code in codes.tolist()]).encode(REPLAY_CODEC), dtype=np.uint32)
+    return text, np.repeat(np.arange(len(codes)), vocabulary.lengths[codes].astype(np.int64))
+
+
+def count_words(tables: Iterable[TurnTable], stage: Any = NULL_STAGE) -> np.ndarray:
+    """Count how often each word of the vocabulary was placed down over every turn table, the turns counted are added to the count of the stage."""
+    vocabulary = get_vocabulary()
+    counts = np.zeros(0, dtype=np.int64)
+
+    for table in tables:
+        stage.count += len(table.turns)
+        counts = vocabulary.add_counts(counts, table.turns["word_id"].to_numpy())
+
+    return counts
+
+
+def calculate_letter_frequency(tables: Iterable[TurnTable]) -> Dict[str, int]:
+    """Calculate the frequency of every letter placed down."""
+    with instrumentation.stage("aggregate") as stage:
+        return get_vocabulary().count_letters(count_words(tables, stage))
+
+
+def calculate_word_length_frequency(tables: Iterable[TurnTable]) -> Dict[int, int]:
+    """Calculate the frequency of every word length placed down."""
+    with instrumentation.stage("aggregate") as stage:
+        return get_vocabulary().count_lengths(count_words(tables, stage))
+
+
+def count_squares(board_lengths: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Count the coordinates placed on into the packed grids of every board size, see SQUARE_OFFSETS."""
+    board_lengths = board_lengths.astype(np.int64)
+    valid = (board_lengths >= LOWER_LIMIT) & (board_lengths <= UPPER_LIMIT) & (rows >= 0) & (rows < board_lengths) & (columns >= 0) & (columns < board_lengths)
+    squares = np.asarray(SQUARE_OFFSETS)[board_lengths[valid]] + rows[valid] * board_lengths[valid] + columns[valid]
+    return np.bincount(squares, minlength=SQUARE_OFFSETS[-1]).astype(np.int32)
 
+
+def calculate_square_usage(tables: Iterable[TurnTable]) -> Dict[int, np.ndarray]:
+    """Count how often every square was placed on, as a grid for each board size. Row and column i of a grid are row and column i + 1 of the board."""
+    with instrumentation.stage("aggregate") as stage:
+        usage = np.zeros(SQUARE_OFFSETS[-1], dtype=np.int32)
+
+        for table in tables:
+            stage.count += len(table.turns)
+
+            # Every path is expanded into its coordinates one chunk of games at a time
+            paths = table.turns[table.turns["path_length"] > 0]
+            lengths = paths["path_length"].to_numpy()
+            owners = np.repeat(np.arange(len(paths)), lengths)
+            steps = group_offsets(lengths)
+            board_lengths = table.games["board_length"].to_numpy()[paths["game_id"].to_numpy()][owners]
+            rows = paths["path_row"].to_numpy(dtype=np.int64)[owners] + steps * paths["row_step"].to_numpy(dtype=np.int64)[owners]
+            columns = paths["path_column"].to_numpy(dtype=np.int64)[owners] + steps * paths["column_step"].to_numpy(dtype=np.int64)[owners]
+            usage += count_squares(board_lengths, rows, columns)
+
+        return {board_length: usage[SQUARE_OFFSETS[board_length]:SQUARE_OFFSETS[board_length + 1]].reshape(board_length, board_length)
+                for board_length in range(LOWER_LIMIT, UPPER_LIMIT + 1) if usage[SQUARE_OFFSETS[board_length]:SQUARE_OFFSETS[board_length + 1]].any()}
+
+
+def plot_letter_frequency(letter_frequency: Dict[str, int]) -> Any:
+    """Plot a bar graph for letter frequency."""
+    with instrumentation.stage("render"):
+        # The data to work with
         for letter in LETTER_VALUE.keys():
             if letter not in letter_frequency:
                 letter_frequency[letter] = 0
@@ -499,7 +1734,6 @@ def display_letter_frequency_bar_graph() -> None:
 
         # The plot
         fig = plt.figure(1)
-        fig.canvas.set_window_title('Letter Frequency Bar Graph')
         plt.xlabel("Letter")
         plt.ylabel("Frequency")
         plt.title("Letter Frequency")
@@ -562,54 +1796,357 @@ def display_letter_frequency_bar_graph() -> None:
         # Legend of colour values
         plt.legend(title='Value', handles=[purple_value, pink_value, red_value, brown_value, orange_value, olive_value, green_value, cyan_value, blue_value, gray_value])
 
-        plt.show()
+        return fig
+
+
+def plot_word_length_frequency(word_length_frequency: Dict[int, int]) -> Any:
+    """Plot a bar graph for word length frequency."""
+    with instrumentation.stage("render"):
+        # The data to work with
+        length_list = sort_dict_by_values(word_length_frequency)
+
+        # The plot
+        fig = plt.figure(1)
+        plt.xlabel("Word Length")
+        plt.ylabel("Frequency")
+        plt.title("Word Length Frequency")
+        plt.bar(*zip(*length_list))
+        caption = f"Generated by {__title__}."
+        fig.text(0.1, 0.01, caption, ha='left')
+
+        # For placing the frequency number on top of each bar
+        x = []
+        y = []
+
+        for i in length_list:
+            x.append(i[0])
+            y.append(i[1])
+
+        for i in range(len(length_list)):
+            plt.annotate(str(y[i]), xy=(x[i], y[i]), ha='center', va='bottom')
+
+        return fig
+
+
+def plot_square_usage(usage: Dict[int, np.ndarray], annotations: bool = False) -> Any:
+    """Plot a heatmap for board occupancy likelihood, side by side for each board size."""
+    with instrumentation.stage("render"):
+        # The plot
+        fig, axes = plt.subplots(1, max(len(usage), 1), squeeze=False, figsize=(6.4 * max(len(usage), 1), 4.8))
+        caption = f"Generated by {__title__}."
+        fig.text(0.3, 0.01, caption, ha='left')
+
+        for ax, (board_length, grid) in zip(axes[0], usage.items()):
+            # Any square holding at least 1% of the placements is shown as fully occupied
+            df = pd.DataFrame(np.minimum(grid / grid.sum() * 100, 1), index=range(1, board_length + 1), columns=range(1, board_length + 1))
+            sns.heatmap(df, ax=ax, annot=annotations, annot_kws={"size": 8.9}, fmt='0.2f', cmap='coolwarm', cbar_kws={'label': 'Relative Occupancy Probability', 'orientation': 'horizontal', 'shrink': 0.5}, linewidths=0.5, linecolor='black', vmin=0, vmax=1, square=True)
+            ax.set_title("Square Usage" if len(usage) == 1 else f"Square Usage ({board_length} x {board_length})")
+            ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
+            ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
+            ax.set_ylabel('')
+            ax.set_xlabel('')
+            colour_bar = ax.collections[0].colorbar
+            colour_bar.set_ticks([0, .25, .5, .75, 1])
+            colour_bar.set_ticklabels(['0.00', '0.25', '0.50', '0.75', '1.00'])
+
+            for _, spine in ax.spines.items():
+                spine.set_visible(True)
+
+        return fig
+
+
+def get_game_mode(player_types: Iterable[str]) -> Optional[str]:
+    """Get the game mode from the types of the players."""
+    player_types = set(player_types)
+
+    if not player_types:
+        return None
+    elif "human" not in player_types:
+        return "Computer Vs Computer"
+    elif "computer" not in player_types:
+        return "Human Vs Human"
+    else:
+        return "Human Vs Computer"
+
+
+def summarise_replay_files(directory: str = LOCAL_DIR_REPLAYS, workers: int = INGEST_WORKERS, board_length: Optional[int] = None, game_mode: Optional[str] = None,
+                           report: Optional[IngestReport] = None) -> List[Dict[str, Any]]:
+    """Summarise every file within a folder, the fields of files that are not valid replays are None. Only the replays of a board length and a game mode are summarised if either is given.
+
+    The files whose headers are read, and the files indexed as corrupted or outdated, are added to the report given.
+    """
+    file_list = list_replay_files(directory)
+
+    # The indexed files are looked up in the index, the rest only have their header and players read instead of being decoded
+    report = IngestReport() if report is None else report
+
+    with ReplayIndex(directory) as index:
+        removed, stale = index.scan(headers_only=True)
+
+        with instrumentation.stage("read") as stage:
+            summaries = index.summaries(board_length, game_mode)
+            stage.count = len(summaries)
+
+        with instrumentation.stage("headers") as stage:
+            stage.count = len(stale)
+            stats = {file: (size, mtime) for file, size, mtime in stale}
+            headers = []
+
+            for file, header in ingest_replays(directory, list(stats), report, workers, loader=scan_replay_header):
+                headers.append((file, *stats[file], header))
+                summaries.pop(file, None)
+
+                if header is None:
+                    continue
+
+                mode = get_game_mode(player_type for _, player_type in header.players)
+
+                if mode is not None and board_length in (None, header.board_length) and game_mode in (None, mode):
+                    summaries[file] = {"file": file, "board_size": header.board_length, "number_of_players": len(header.players), "game_mode": mode, "game_duration": header.game_duration}
+
+        # The headers are kept in the index, so the next check reads them from there
+        with instrumentation.stage("write") as stage:
+            stage.count = len(headers)
+            index.insert_headers(headers)
+
+        index.report_failures(report, removed)
+
+    # The files that are no longer there are left out, as they are only dropped from the index by its next update
+    if board_length is None and game_mode is None:
+        return [summaries.get(file) or {"file": file, "board_size": None, "number_of_players": None, "game_mode": None, "game_duration": None} for file in file_list]
+
+    return [summaries[file] for file in file_list if file in summaries]
+
+
+def load_board_sizes(directory: str = LOCAL_DIR_REPLAYS, workers: int = INGEST_WORKERS, report: Optional[IngestReport] = None) -> List[int]:
+    """The board length of every valid replay within a folder. The files decoded are added to the report given."""
+    with ReplayIndex(directory) as index:
+        index.update(workers, report=report)
+        return [board_length for _, board_length, _ in index.headers().values()]
+
+
+def iter_games(directory: str = LOCAL_DIR_REPLAYS, board_length: Optional[int] = None, workers: int = INGEST_WORKERS, report: Optional[IngestReport] = None) -> Iterator[Tuple[str, Replay]]:
+    """Stream every valid replay within a folder, optionally only those of a single board length. The files decoded are added to the report given."""
+    # Only the replay files that are new or have changed since the last analysis are decoded, the rest are read back from the index one at a time
+    with ReplayIndex(directory) as index:
+        index.update(workers, report=report)
+        yield from index.replays(board_length=board_length)
+
+
+def iter_turns(games: Iterable[Tuple[str, Replay]], chunk_size: int = TURN_TABLE_CHUNK_SIZE) -> Iterator[TurnTable]:
+    """Stream the turns of the games as turn tables of at most chunk_size games each, so memory does not grow with the number of games."""
+    games = iter(games)
+
+    while True:
+        # Reading the games includes decoding any that are new, the first time the games are read from the index
+        with instrumentation.stage("read") as stage:
+            chunk = list(islice(games, chunk_size))
+            stage.count = len(chunk)
+
+        if not chunk:
+            return
+
+        yield TurnTable.from_replays(chunk)
+
+
+def load_player_statistics(directory: str = LOCAL_DIR_REPLAYS, workers: int = INGEST_WORKERS, report: Optional[IngestReport] = None) -> Dict[int, PlayerStatistics]:
+    """Load the player statistics of the games of each board length within a folder. The files decoded are added to the report given."""
+    # Only the replay files that are new or have changed since the last analysis are decoded and added to the statistics
+    with ReplayIndex(directory) as index:
+        index.update(workers, report=report)
+
+        with instrumentation.stage("read") as stage:
+            shards = index.player_statistics()
+            stage.count = len(shards)
+
+        return {board_length: statistics for board_length, statistics in shards.items() if statistics.players}
+
+
+def calculate_player_statistics(shards: Dict[int, PlayerStatistics], board_length: Optional[int] = None, k: int = TOP_K) -> List[Dict[str, Any]]:
+    """Calculate the statistics of every player over every board length, or only a single board length."""
+    with instrumentation.stage("aggregate") as stage:
+        statistics = PlayerStatistics()
+
+        for shard_length, shard in shards.items():
+            if board_length is None or shard_length == board_length:
+                statistics.merge(shard)
 
-    board_size_list = []
-    word_list = []
-    letter_list = []
+        stage.count = len(statistics.players)
+        return statistics.statistics(k)
+
+
+def check_files() -> None:
+    """Open all the files to check their board size."""
+    # Do not run this on PyCharm due to the code msvcrt.getch() contained within this component
+    try:
+        file_list = list_replay_files()
+
+        if len(file_list) == 0:
+            clear_screen()
+            print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
+            print(Fore.RED + Style.BRIGHT + "Error: No files detected!")
+            print(Fore.WHITE + Style.BRIGHT + "Press any key to return to main menu.")
+            msvcrt.getch()
+            return
+
+        clear_screen()
+
+        while True:
+            board_size = input_integer("Board Size (Type 0 to go back to main menu): ")
+
+            if board_size == 0:
+                return
+            elif board_size < LOWER_LIMIT or board_size > UPPER_LIMIT:
+                clear_screen()
+                print(Fore.WHITE + Style.BRIGHT + "Board Size (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "Invalid board size!")
+                print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
+                msvcrt.getch()
+                clear_screen()
+            else:
+                # Only the files of the board size are looked up and shown
+                report = IngestReport()
+                summaries = summarise_replay_files(board_length=board_size, report=report)
+                clear_screen()
+                print(f"Board Size Required: {board_size}\n{len(file_list)} files have been checked, {len(summaries)} files have a board size of {board_size}.\n")
+
+                for summary in summaries:
+                    print(Fore.GREEN + Style.BRIGHT + f"{summary['file']} | Board Size: {summary['board_size']} | Number of Players: {summary['number_of_players']} | Game Mode: {summary['game_mode']} | Game Duration: {summary['game_duration']}")
+
+                report.display()
+
+                print(Fore.GREEN + Style.BRIGHT + "\nProcess Complete!")
+                print(Fore.WHITE + Style.BRIGHT + "Press any key to return to main menu.")
+                msvcrt.getch()
+                return
+    except FileNotFoundError:
+        clear_screen()
+        print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
+        print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
+
+        # Create the folder if it does not exist
+        try:
+            os.makedirs('Replays')
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
+        msvcrt.getch()
+        clear_screen()
+
+
+def display_player_statistics() -> None:
+    """Display the player's statistics."""
+    def display_data() -> None:
+        """Display data."""
+        title = "Player Statistics"
+        clear_screen()
+        print(f"{title}\n{'-' * len(title)}\r")
+
+        for player in calculate_player_statistics(shards):
+            if player['difficulty'] is None:
+                print(f"\n{player['player_name']}\nWINS: {player['wins']} LOSES: {player['loses']} DRAWS: {player['draws']}")
+            else:
+                print(f"\n{player['player_name']} ({player['difficulty']}) - {player['type'].capitalize()}\nWINS: {player['wins']} LOSES: {player['loses']} DRAWS: {player['draws']}")
+
+            print(f"Total Games Played: {player['total_games']}\nWin Rate: {player['win_rate']}%")
+
+            if player['most_frequent_words']:
+                print(f"Most Frequent Words: {', '.join(player['most_frequent_words'])}\nMost Frequent Letters: {', '.join(player['most_frequent_letters'])}")
+                print("Avg Word Strength Per Turn:", player['avg_word_strength'])
+
+                if player['invalid_words']:
+                    print("Words With Invalid Characters:", player['invalid_words'])
+            else:
+                print(f"Most Frequent Words: 0\nMost Frequent Letters: 0")
+
+        # The files skipped while the statistics were updated are listed below them
+        if report.failed:
+            print()
+            report.display()
+
+        print(Fore.WHITE + Style.BRIGHT + "\nPress any key to continue...")
+        msvcrt.getch()
 
     try:
-        file_list = os.listdir(LOCAL_DIR_REPLAYS)
+        file_list = list_replay_files()
 
         if len(file_list) == 0:
-            clear_screen(0)
+            clear_screen()
             print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
             print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder is empty!")
             print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
             msvcrt.getch()
-            clear_screen(0)
+            clear_screen()
+        else:
+            report = IngestReport()
+            shards = load_player_statistics(report=report)
+
+            board_size_list = list(shards)
+            difference = False
+            temp_num = None
+
+            for i in board_size_list:
+                if (i >= LOWER_LIMIT or i <= UPPER_LIMIT) and temp_num is None:
+                    temp_num = i
+                else:
+                    if i != temp_num and not difference:
+                        difference = True
+                        clear_screen()
+                        print(Fore.YELLOW + Style.BRIGHT + "Warning: Multiple files are containing different board sizes. Are you sure you want to continue?")
+                        user_input = input(Fore.WHITE + Style.BRIGHT + "Y / N: ").upper()
+
+                        if user_input == "":
+                            display_letter_frequency_bar_graph()
+                        elif user_input == "Y":
+                            display_data()
+                            return
+                        elif user_input == "N":
+                            return
+                        else:
+                            display_letter_frequency_bar_graph()
+
+            if not difference:
+                display_data()
+    except FileNotFoundError:
+        clear_screen()
+        print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
+        print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
+
+        # Create the folder if it does not exist
+        try:
+            os.makedirs('Replays')
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+        print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
+        msvcrt.getch()
+        clear_screen()
+
+
+def display_letter_frequency_bar_graph() -> None:
+    """Generate a bar graph for letter frequency and display it."""
+    def display_plot() -> None:
+        """Display plot."""
+        fig = plot_letter_frequency(calculate_letter_frequency(iter_turns(iter_games())))
+        fig.canvas.set_window_title('Letter Frequency Bar Graph')
+        report.display()
+        plt.show()
+
+    try:
+        file_list = list_replay_files()
+
+        if len(file_list) == 0:
+            clear_screen()
+            print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
+            print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder is empty!")
+            print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
+            msvcrt.getch()
+            clear_screen()
         else:
-            # Open every .wbr file within the 'Replays' folder
-            for file in file_list:
-                file = file[:-4] # Remove the file extension
-
-                if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
-                    try:
-                        with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                            bytes_data = f.read().splitlines()
-                            data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                            wbr_content = {"wbr_game_info": data}
-                            replay_info = json.dumps(wbr_content, indent=7)
-                            replay_info = json.loads(replay_info)
-
-                            if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0]['board_length'] > 0:
-                                board_size_list.append(replay_info['wbr_game_info'][0]['board_length'])
-                                replay_info['wbr_game_info'].pop(0)
-
-                                for player in replay_info['wbr_game_info']:
-                                    word = player['word']
-
-                                    if word is not None:
-                                        word_list.append(word)
-
-                                        for letter in word:
-                                            letter_list.append(letter)
-                            else:
-                                pass
-                    except (KeyError, ValueError, SyntaxError, OverflowError):
-                        pass
-                else:
-                    pass
+            report = IngestReport()
+            board_size_list = load_board_sizes(report=report)
 
             difference = False
             temp_num = None
@@ -620,7 +2157,7 @@ def display_letter_frequency_bar_graph() -> None:
                 else:
                     if i != temp_num and not difference:
                         difference = True
-                        clear_screen(0)
+                        clear_screen()
                         print(Fore.YELLOW + Style.BRIGHT + "Warning: Multiple files are containing different board sizes. Are you sure you want to continue?")
                         user_input = input(Fore.WHITE + Style.BRIGHT + "Y / N: ").upper()
 
@@ -636,7 +2173,7 @@ def display_letter_frequency_bar_graph() -> None:
             if not difference:
                 display_plot()
     except FileNotFoundError:
-        clear_screen(0)
+        clear_screen()
         print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
         print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
 
@@ -649,91 +2186,31 @@ def display_letter_frequency_bar_graph() -> None:
 
         print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
         msvcrt.getch()
-        clear_screen(0)
+        clear_screen()
 
 
 def display_word_length_frequency_bar_graph() -> None:
     """Generate a bar graph for word length frequency and display it."""
     def display_plot() -> None:
         """Display plot."""
-        # The data to work with
-        length_list = sort_dict_by_values(word_length_dict)
-
-        # The plot
-        fig = plt.figure(1)
+        fig = plot_word_length_frequency(calculate_word_length_frequency(iter_turns(iter_games())))
         fig.canvas.set_window_title('Word Length Bar Graph')
-        plt.xlabel("Word Length")
-        plt.ylabel("Frequency")
-        plt.title("Word Length Frequency")
-        plt.bar(*zip(*length_list))
-        caption = f"Generated by {__title__}."
-        fig.text(0.1, 0.01, caption, ha='left')
-
-        # For placing the frequency number on top of each bar
-        x = []
-        y = []
-
-        for i in length_list:
-            x.append(i[0])
-            y.append(i[1])
-
-        for i in range(len(length_list)):
-            plt.annotate(str(y[i]), xy=(x[i], y[i]), ha='center', va='bottom')
-
+        report.display()
         plt.show()
 
-    board_size_list = []
-    word_list = []
-    word_length_dict = {}
-
     try:
-        file_list = os.listdir(LOCAL_DIR_REPLAYS)
+        file_list = list_replay_files()
 
         if len(file_list) == 0:
-            clear_screen(0)
+            clear_screen()
             print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
             print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder is empty!")
             print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
             msvcrt.getch()
-            clear_screen(0)
+            clear_screen()
         else:
-            # Open every .wbr file within the 'Replays' folder
-            for file in file_list:
-                file = file[:-4]  # Remove the file extension
-
-                if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
-                    try:
-                        with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                            bytes_data = f.read().splitlines()
-                            data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                            wbr_content = {"wbr_game_info": data}
-                            replay_info = json.dumps(wbr_content, indent=7)
-                            replay_info = json.loads(replay_info)
-
-                            if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0][
-                                'board_length'] > 0:
-                                board_size_list.append(replay_info['wbr_game_info'][0]['board_length'])
-                                replay_info['wbr_game_info'].pop(0)
-
-                                for player in replay_info['wbr_game_info']:
-                                    word = player['word']
-
-                                    if word is not None:
-                                        word_list.append(word)
-                            else:
-                                pass
-                    except (KeyError, ValueError, SyntaxError, OverflowError):
-                        pass
-                else:
-                    pass
-
-            for word in word_list:
-                length = len(word)
-
-                if length not in word_length_dict:
-                    word_length_dict[length] = 1
-                else:
-                    word_length_dict[length] += 1
+            report = IngestReport()
+            board_size_list = load_board_sizes(report=report)
 
             difference = False
             temp_num = None
@@ -744,7 +2221,7 @@ def display_word_length_frequency_bar_graph() -> None:
                 else:
                     if i != temp_num and not difference:
                         difference = True
-                        clear_screen(0)
+                        clear_screen()
                         print(Fore.YELLOW + Style.BRIGHT + "Warning: Multiple files are containing different board sizes. Are you sure you want to continue?")
                         user_input = input(Fore.WHITE + Style.BRIGHT + "Y / N: ").upper()
 
@@ -760,7 +2237,7 @@ def display_word_length_frequency_bar_graph() -> None:
             if not difference:
                 display_plot()
     except FileNotFoundError:
-        clear_screen(0)
+        clear_screen()
         print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
         print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
 
@@ -773,7 +2250,7 @@ def display_word_length_frequency_bar_graph() -> None:
 
         print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
         msvcrt.getch()
-        clear_screen(0)
+        clear_screen()
 
 
 def display_square_usage_heatmap() -> None:
@@ -781,7 +2258,7 @@ def display_square_usage_heatmap() -> None:
     def display_plot() -> None:
         """Display plot."""
         # Annotations
-        clear_screen(0)
+        clear_screen()
         annotations = False
         user_input = input("Display annotations? Y / N: ").upper()
 
@@ -795,116 +2272,27 @@ def display_square_usage_heatmap() -> None:
             display_plot()
 
         # The data to work with
-        path_list = []
-
-        for paths in path_collection:
-            for path in paths:
-                path[0] += 1
-                path[1] += 1
-                path_list.append(path)
-
-        # The plot
-        fig = plt.figure(1)
+        fig = plot_square_usage(calculate_square_usage(iter_turns(iter_games(report=report))), annotations)
         fig.canvas.set_window_title('Square Usage Heatmap')
-        plt.title("Square Usage")
-        caption = f"Generated by {__title__}."
-        fig.text(0.3, 0.01, caption, ha='left')
-        df = pd.DataFrame(path_list, columns=['y', 'x'])
-        df2 = pd.crosstab(df['y'], df['x']).div(len(df)).multiply(100)
-
-        for x in df2:
-            for y in df2:
-                if df2[x][y] >= 1:
-                    df2[x][y] = 1
-        
-        ax = sns.heatmap(df2, annot=annotations, annot_kws={"size": 8.9}, fmt='0.2f', cmap='coolwarm', cbar_kws={'label': 'Relative Occupancy Probability', 'orientation': 'horizontal', 'shrink': 0.5}, linewidths=0.5, linecolor='black', vmin=0, vmax=1, square=True)
-        ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=0)
-        ax.set_ylabel('')
-        ax.set_xlabel('')
-        colour_bar = ax.collections[0].colorbar
-        colour_bar.set_ticks([0, .25, .5, .75, 1])
-        colour_bar.set_ticklabels(['0.00', '0.25', '0.50', '0.75', '1.00'])
-
-        for _, spine in ax.spines.items():
-            spine.set_visible(True)
-
+        report.display()
         plt.show()
 
-    board_size_list = []
-    path_collection = []
-    board_size = None
-
     try:
-        file_list = os.listdir(LOCAL_DIR_REPLAYS)
+        file_list = list_replay_files()
 
         if len(file_list) == 0:
-            clear_screen(0)
+            clear_screen()
             print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
             print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder is empty!")
             print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
             msvcrt.getch()
-            clear_screen(0)
+            clear_screen()
         else:
-            # Open every .wbr file within the 'Replays' folder
-            for file in file_list:
-                file = file[:-4] # Remove the file extension
-
-                if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
-                    try:
-                        with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                            bytes_data = f.read().splitlines()
-                            data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                            wbr_content = {"wbr_game_info": data}
-                            replay_info = json.dumps(wbr_content, indent=7)
-                            replay_info = json.loads(replay_info)
-
-                            if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0]['board_length'] > 0:
-                                board_size_list.append(replay_info['wbr_game_info'][0]['board_length'])
-
-                                if board_size is None:
-                                    board_size = replay_info['wbr_game_info'][0]["board_length"]
-
-                                replay_info['wbr_game_info'].pop(0)
-
-                                for player in replay_info['wbr_game_info']:
-                                    path = player['selected_path']
-
-                                    if path is not None:
-                                        path_collection.append(path)
-                            else:
-                                pass
-                    except (KeyError, ValueError, SyntaxError, OverflowError):
-                        pass
-                else:
-                    pass
-
-            difference = False
-            temp_num = None
-
-            for i in board_size_list:
-                if (i >= LOWER_LIMIT or i <= UPPER_LIMIT) and temp_num is None:
-                    temp_num = i
-                else:
-                    if i != temp_num and not difference:
-                        difference = True
-                        clear_screen(0)
-                        print(Fore.YELLOW + Style.BRIGHT + "Warning: Multiple files are containing different board sizes. Are you sure you want to continue?")
-                        user_input = input(Fore.WHITE + Style.BRIGHT + "Y / N: ").upper()
-
-                        if user_input == "":
-                            display_square_usage_heatmap()
-                        elif user_input == "Y":
-                            display_plot()
-                        elif user_input == "N":
-                            main()
-                        else:
-                            display_square_usage_heatmap()
-
-            if not difference:
-                display_plot()
+            # Games of different board sizes are shown as separate heatmaps
+            report = IngestReport()
+            display_plot()
     except FileNotFoundError:
-        clear_screen(0)
+        clear_screen()
         print(Fore.WHITE + Style.BRIGHT + f"{__title__} v{__version__} System Event")
         print(Fore.RED + Style.BRIGHT + "Error: The 'Replays' folder cannot be found! This folder is now created.")
 
@@ -917,120 +2305,132 @@ def display_square_usage_heatmap() -> None:
 
         print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
         msvcrt.getch()
-        clear_screen(0)
+        clear_screen()
 
 
 def open_replay() -> None:
-    """Open .wbr files to watch them."""
-    def run_replay(replay_info: dict, replay_speed: float) -> None:
-        """Run the replay file."""
-        board = Board()
-        board.create_board(replay_info['wbr_game_info'][0]['board_length'])
-        game_duration = replay_info['wbr_game_info'][0]['game_duration']
-        board.game_duration = game_duration
-        players = []
-
-        for player in replay_info['wbr_game_info'][1:]:
-            if player['player_name'] not in players:
-                players.append({"name": player['player_name'], "type": player['type'], "difficulty": player['difficulty']})
-
-        board.players = [dict(t) for t in {tuple(d.items()) for d in players}]
-        board.player = players[0]['name']
-
-        if players[0]['difficulty'] is not None:
-            board.player = f"{players[0]['name']} ({players[0]['difficulty']})"
-
-        board.game_counter = replay_info['wbr_game_info'][0]['game_number']
-        clear_screen(0)
-        board.display_game_title()
-        board.display_board()
-        print(f"Replay speed: {replay_speed}\nReplay file: {file}{REPLAY_FILE_FORMAT}\n")
-
-        for player in replay_info['wbr_game_info'][1:]:
-            event = player['event']
-            player_name = player['player_name']
-            player_type = player['type']
-            board.player = player_name
-
-            if player_type == "computer":
-                player_name = f"{player['player_name']} ({player['difficulty']})"
-
-            if event == 'RESIGNED':
-                clear_screen(1.5) # Do not delete!
-                board.display_game_title(False, False, True) # Do not delete!
-                board.display_board() # Do not delete!
-                print(f"Replay speed: {replay_speed}\nReplay file: {file}{REPLAY_FILE_FORMAT}\n") # Do not delete!
-                clear_screen(1.5)
-                board.display_game_title(False, False, True)
-            elif event == 'WON':
-                board.winner = player_name
-                clear_screen(0)
-                board.display_game_title(False, True)
-            elif event == 'PLAYING':
-                board.turn_counter += 1
-                board.selected_path = [tuple(i) for i in player['selected_path']]
-                board.place_word(player['word'])
-                board.previous_player = player_name
-                clear_screen(replay_speed)
-                board.display_game_title()
-            elif event == 'DRAW':
-                board.draw = True
-                clear_screen(1)
-                board.display_game_title(True)
-
-            board.display_board()
-            print(f"Replay speed: {replay_speed}\nReplay file: {file}{REPLAY_FILE_FORMAT}\n")
+    """Open .wbr or .wbrb files to watch them."""
+    previous_frame = None
+
+    def draw_frame(engine: "ReplayEngine", footer: str) -> None:
+        """Draw the game title, the board and the footer over the previous frame, only rewriting the lines that changed."""
+        nonlocal previous_frame
+        frame = engine.render() + footer
+        redraw_screen(frame, previous_frame)
+        previous_frame = frame
+
+    def play(engine: "ReplayEngine", replay_speed: float, file_name: str) -> None:
+        """Play the replay from the first turn."""
+        nonlocal previous_frame
+        footer = f"Replay speed: {replay_speed}\nReplay file: {file_name}\n\n"
+        engine.seek(0)
+        previous_frame = None
+        clear_screen()
+        draw_frame(engine, footer)
+
+        for turn in engine.replay.turns:
+            if turn.event == 'RESIGNED':
+                pause(1.5) # Do not delete!
+                engine.seek(engine.turn + 1)
+                draw_frame(engine, footer) # Do not delete!
+                pause(1.5)
+            elif turn.event == 'PLAYING':
+                pause(replay_speed)
+                engine.seek(engine.turn + 1)
+                draw_frame(engine, footer)
+            elif turn.event == 'DRAW':
+                pause(1)
+                engine.seek(engine.turn + 1)
+                draw_frame(engine, footer)
+            else:
+                engine.seek(engine.turn + 1)
+                draw_frame(engine, footer)
 
         print("Replay finished, press any key to continue...")
         msvcrt.getch()
 
+    def step_through(engine: "ReplayEngine", file_name: str) -> None:
+        """Step back and forth through the turns of the replay, or jump straight to one."""
+        nonlocal previous_frame
+        last_turn = len(engine.replay.turns)
+        previous_frame = None
+        clear_screen()
+
+        while True:
+            draw_frame(engine, f"Replay turn: {engine.turn} of {last_turn}\nReplay file: {file_name}\n\n"
+                               f"[N] Next turn | [P] Previous turn | [F] Forward {REPLAY_SKIP_TURNS} turns | [B] Back {REPLAY_SKIP_TURNS} turns | [E] Last turn | [Q] Replay menu\n"
+                               f"Type a turn number to jump straight to it\n")
+            command = input(Fore.WHITE + Style.BRIGHT + "Command: ").strip().upper()
+
+            if command in ("", "N"):
+                engine.seek(engine.turn + 1)
+            elif command == "P":
+                engine.seek(engine.turn - 1)
+            elif command == "F":
+                engine.seek(engine.turn + REPLAY_SKIP_TURNS)
+            elif command == "B":
+                engine.seek(engine.turn - REPLAY_SKIP_TURNS)
+            elif command == "E":
+                engine.seek(last_turn)
+            elif command == "Q":
+                return
+            elif command.isdigit():
+                engine.seek(int(command))
+
+    def get_replay_speed() -> float:
+        """Set how fast each turn cycles, 0 goes back to main menu."""
+        while True:
+            try:
+                replay_speed = float(input("Replay speed. Type 0 to go back to main menu: "))
+
+                if replay_speed >= 0:
+                    return replay_speed
+            except ValueError:
+                pass
+
+            clear_screen()
+
+    def replay_menu(engine: "ReplayEngine", replay_speed: float, file_name: str) -> bool:
+        """Show the replay menu until another file is opened, which returns True, or main menu is chosen."""
         while True:
-            clear_screen(0)
-            print(Fore.WHITE + Style.BRIGHT + "Replay menu\n[1] Watch again\n[2] Change speed and watch again\n[3] Open another file\n[4] Go back to main menu\n")
+            clear_screen()
+            print(Fore.WHITE + Style.BRIGHT + "Replay menu\n[1] Watch again\n[2] Change speed and watch again\n[3] Step through turns\n[4] Open another file\n[5] Go back to main menu\n")
 
             try:
                 selection = int(input((Fore.WHITE + Style.BRIGHT + "Selection: ")))
                 if selection == 1:
-                    run_replay(replay_info, replay_speed)
+                    play(engine, replay_speed, file_name)
                 elif selection == 2:
-                    clear_screen(0)
-                    get_replay_speed(replay_info)
+                    clear_screen()
+                    replay_speed = get_replay_speed()
+
+                    if replay_speed == 0:
+                        return False
+
+                    play(engine, replay_speed, file_name)
                 elif selection == 3:
-                    clear_screen(0)
-                    open_replay()
+                    step_through(engine, file_name)
                 elif selection == 4:
-                    main()
+                    clear_screen()
+                    return True
+                elif selection == 5:
+                    return False
                 else:
                     pass
             except ValueError:
                 pass
 
-    def get_replay_speed(replay_info: dict) -> None:
-        """Set how fast each turn cycles."""
-        try:
-            replay_speed = float(input("Replay speed. Type 0 to go back to main menu: "))
-            if replay_speed > 0:
-                run_replay(replay_info, replay_speed)
-            elif replay_speed == 0:
-                main()
-            else:
-                clear_screen(0)
-                get_replay_speed(replay_info)
-        except ValueError:
-            clear_screen(0)
-            get_replay_speed(replay_info)
-
     while True:
         file = input(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): ")
 
         if file == "0":
-            main()
+            return
         elif file == "":
-            clear_screen(0)
+            clear_screen()
             print(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "filename cannot be empty!")
             print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
             msvcrt.getch()
-            clear_screen(0)
+            clear_screen()
         else:
             # Create the folder if it does not exist
             try:
@@ -1039,36 +2439,150 @@ def open_replay() -> None:
                 if e.errno != errno.EEXIST:
                     raise
 
-            if os.path.isfile(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}"):
+            file_name = next((f"{file}{file_format}" for file_format in REPLAY_FILE_FORMATS if replay_file_exists(f"{LOCAL_DIR_REPLAYS}{file}{file_format}")), None)
+
+            if file_name is not None:
+                # The game is decoded and played through once, every later seek starts from a snapshot or the current turn
                 try:
-                    with open(f"{LOCAL_DIR_REPLAYS}{file}{REPLAY_FILE_FORMAT}") as f:
-                        bytes_data = f.read().splitlines()
-                        data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
-                        wbr_content = {"wbr_game_info": data}
-                        replay_info = json.dumps(wbr_content, indent=7)
-                        replay_info = json.loads(replay_info)
-
-                        if replay_info['wbr_game_info'][0]['game_number'] > 0 and replay_info['wbr_game_info'][0]['board_length'] > 0:
-                            clear_screen(0)
-                            get_replay_speed(replay_info)
-                        else:
-                            clear_screen(0)
-                            print(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "File not found or file extension not supported! Only .wbr (Word Battle Replay) files are supported.")
-                            print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
-                            msvcrt.getch()
-                            clear_screen(0)
-                except (KeyError, ValueError, SyntaxError, OverflowError):
-                    clear_screen(0)
+                    engine = ReplayEngine(load_replay(f"{LOCAL_DIR_REPLAYS}{file_name}"))
+                except REPLAY_ERRORS + (IndexError, TypeError):
+                    clear_screen()
                     print(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "File is corrupted or outdated and cannot be opened!")
                     print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
                     msvcrt.getch()
-                    clear_screen(0)
+                    clear_screen()
+                else:
+                    clear_screen()
+                    replay_speed = get_replay_speed()
+
+                    if replay_speed == 0:
+                        return
+
+                    play(engine, replay_speed, file_name)
+
+                    if not replay_menu(engine, replay_speed, file_name):
+                        return
             else:
-                clear_screen(0)
-                print(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "File not found or file extension not supported! Only .wbr (Word Battle Replay) files are supported.")
+                clear_screen()
+                print(Fore.WHITE + Style.BRIGHT + "Filename (Type 0 to go back to main menu): " + Fore.RED + Style.BRIGHT + "File not found or file extension not supported! Only .wbr (Word Battle Replay) and .wbrb (Word Battle Binary Replay) files are supported.")
                 print(Fore.WHITE + Style.BRIGHT + "Press any key to continue...")
                 msvcrt.getch()
-                clear_screen(0)
+                clear_screen()
+
+class PathTable(NamedTuple):
+    """The three paths from every edge starting position of a board length."""
+    paths: Dict[Tuple[int, int], List[List[Tuple[int, int]]]] # The coordinates of the three paths from each starting position
+    indices: Dict[Tuple[int, int], List[np.ndarray]] # The flat indices into the board of the three paths from each starting position
+    masks: Dict[Tuple[int, int], List[int]] # The occupancy bitmask of the three paths from each starting position
+
+
+def create_path_table(length: int) -> PathTable:
+    """Walk the three paths from every edge starting position of a board length."""
+    last = length - 1
+    paths = {}
+
+    # The direction of each path from each corner, then from each edge, in the order the paths are numbered
+    for x, y in it.product(range(length), repeat=2):
+        if (x, y) == (0, 0):
+            directions = [(0, 1), (1, 1), (1, 0)]
+        elif (x, y) == (0, last):
+            directions = [(0, -1), (1, -1), (1, 0)]
+        elif (x, y) == (last, 0):
+            directions = [(-1, 0), (-1, 1), (0, 1)]
+        elif (x, y) == (last, last):
+            directions = [(-1, 0), (-1, -1), (0, -1)]
+        elif x == 0:
+            directions = [(1, -1), (1, 0), (1, 1)]
+        elif y == 0:
+            directions = [(-1, 1), (0, 1), (1, 1)]
+        elif y == last:
+            directions = [(-1, -1), (0, -1), (1, -1)]
+        elif x == last:
+            directions = [(-1, -1), (-1, 0), (-1, 1)]
+        else:
+            continue
+
+        # Each path runs from the starting position until it leaves the board
+        paths[(x, y)] = [[(x + i * dx, y + i * dy) for i in range(length) if 0 <= x + i * dx < length and 0 <= y + i * dy < length] for dx, dy in directions]
+
+    indices = {position: [np.array([x * length + y for x, y in path], dtype=np.intp) for path in position_paths] for position, position_paths in paths.items()}
+    masks = {position: [sum(1 << int(index) for index in path_indices) for path_indices in position_indices] for position, position_indices in indices.items()}
+    return PathTable(paths, indices, masks)
+
+
+@lru_cache(maxsize=None)
+def get_path_table(length: int) -> PathTable:
+    """Get the path table of a board length, it is created the first time a board of that length is used."""
+    return create_path_table(length)
+
+
+class BitBoard:
+    """Create a compact board core for simulations: an occupancy bitmask and a letter code per square."""
+    def __init__(self, length: int) -> None:
+        self.length = length # The length of the board
+        self.full = (1 << length ** 2) - 1 # The occupancy bitmask of a board with every square taken
+        self.occupied = 0 # Bit i is set when the square with the flat index i = row * length + column holds a letter
+        self.letters = np.zeros(length ** 2, dtype=np.uint8) # The character code of the letter on each square, 0 when it is empty
+        self.history = [] # The occupancy bitmask, the indices and the letters replaced by each placement, for undo
+
+    def copy(self) -> "BitBoard":
+        """Copy the board and its undo history."""
+        board = BitBoard.__new__(BitBoard)
+        board.length = self.length
+        board.full = self.full
+        board.occupied = self.occupied
+        board.letters = self.letters.copy()
+        board.history = self.history.copy()
+        return board
+
+    def is_full(self) -> bool:
+        """Check whether every square holds a letter."""
+        return self.occupied == self.full
+
+    def is_path_full(self, mask: int) -> bool:
+        """Check whether every square of a path, given by its bitmask, holds a letter."""
+        return self.occupied & mask == mask
+
+    def place(self, indices: np.ndarray, word: str, mask: Optional[int] = None) -> None:
+        """Place a word along the squares with the flat indices given, the bitmask of the indices is calculated if omitted."""
+        if mask is None:
+            mask = sum([1 << index for index in indices.tolist()])
+
+        self.history.append((self.occupied, indices, self.letters[indices]))
+        self.letters[indices] = np.frombuffer(word.encode("latin-1", "replace"), dtype=np.uint8)[:len(indices)]
+        self.occupied |= mask
+
+    def undo(self) -> None:
+        """Take back the last placement."""
+        self.occupied, indices, letters = self.history.pop()
+        self.letters[indices] = letters
+
+
+def get_path_indices(path: List[Tuple[int, int]], length: int) -> np.ndarray:
+    """Convert the coordinates of a path into flat indices into a board of a length."""
+    return np.array([x * length + y for x, y in path], dtype=np.intp)
+
+
+class BoardSkeleton(NamedTuple):
+    """The parts of a board frame that only depend on the length of the board."""
+    header: str # The column labels and the top border
+    row_starts: List[str] # The left label of each row
+    row_ends: List[str] # The right label of each row and the border below it
+    footer: str # The bottom border and the column labels
+
+
+@lru_cache(maxsize=None)
+def get_board_skeleton(length: int) -> BoardSkeleton:
+    """Build the static parts of the frame of a board length once."""
+    column_labels = "".join(f"   {column_number}" if column_number < 10 else f"  {column_number}" for column_number in range(1, length + 1))
+    header = Fore.WHITE + Style.BRIGHT + "   " + column_labels + "\n    ┌───┬─" + "──┬─" * (length - 2) + "──┐\n"
+    row_starts = [f"  {row_number} " if row_number < 10 else f" {row_number} " for row_number in range(1, length + 1)]
+
+    # The border below the last row is overwritten by the bottom border after a carriage return
+    row_ends = [f"│ {row_number}\n    ├─" + "──┼─" * (length - 1) + ("──┤\n" if row_number < length else "\r") for row_number in range(1, length + 1)]
+    footer = "    └───┴─" + "──┴─" * (length - 2) + "──┘\n   " + column_labels
+    return BoardSkeleton(header, row_starts, row_ends, footer)
+
 
 class Board:
     """Create an board object."""
@@ -1076,6 +2590,7 @@ class Board:
         self.length = None # The length of the board
         self.matrix = None # The 2D array of the board
         self.colour_map = None # The colours for each cell
+        self.highlight = None # The path and player type the previous word is coloured for in the colour map
         self.starting_position = None # The current starting position
         self.paths = None # A collection of paths
         self.paths_full = None # A collection of full paths
@@ -1091,12 +2606,17 @@ class Board:
         self.game_counter = 0 # Game counter for each game
         self.turn_counter = 0 # Game counter for each game
         self.game_duration = 0 # Game Duration of the whole game
+        self.core = None # The occupancy bitmask and letters of the board, kept in step with the matrix
+        self.placements = [] # The indices, replaced letters, word and previous path of each placement, for undo
 
     def create_board(self, length: int) -> None:
         """Create the game board."""
         self.length = length
         self.matrix = np.full((self.length, self.length), " ", dtype='U1')
         self.colour_map = self.set_colour_map()
+        self.highlight = None
+        self.core = BitBoard(self.length)
+        self.placements = []
 
     def set_colour_map(self) -> Dict[Tuple[Any], Any]:
         """Ini the colours for the board."""
@@ -1106,7 +2626,7 @@ class Board:
 
     def check_draw(self) -> None:
         """Check for a draw."""
-        if " " not in self.matrix:
+        if self.core.is_full():
             self.draw = True
 
     def get_starting_position(self) -> int:
@@ -1124,20 +2644,22 @@ class Board:
 
             if len(user_input) == 1:
                 if 0 not in user_input:
-                    clear_screen(0)
+                    clear_screen()
                     self.display_game_title()
                     self.display_board()
                     print(Fore.WHITE + Style.BRIGHT + "Starting Position: " + Fore.RED + Style.BRIGHT + "Invalid coordinates!")
+                    pause()
                     clear_screen()
                     return self.get_starting_position()
                 else:
                     return 0
             else:
                 if 0 in user_input:
-                    clear_screen(0)
+                    clear_screen()
                     self.display_game_title()
                     self.display_board()
                     print(Fore.WHITE + Style.BRIGHT + "Starting Position: " + Fore.RED + Style.BRIGHT + "Invalid coordinates!")
+                    pause()
                     clear_screen()
                     return self.get_starting_position()
                 else:
@@ -1146,225 +2668,44 @@ class Board:
                             self.starting_position = tuple([n - 1 for n in user_input])
                             return 1
                         else:
-                            clear_screen(0)
+                            clear_screen()
                             self.display_game_title()
                             self.display_board()
                             print(Fore.WHITE + Style.BRIGHT + "Starting Position: " + Fore.RED + Style.BRIGHT + "Invalid coordinates!")
+                            pause()
                             clear_screen()
                             return self.get_starting_position()
                     else:
-                        clear_screen(0)
+                        clear_screen()
                         self.display_game_title()
                         self.display_board()
                         print(Fore.WHITE + Style.BRIGHT + "Starting Position: " + Fore.RED + Style.BRIGHT + "Invalid coordinates!")
+                        pause()
                         clear_screen()
                         return self.get_starting_position()
         except (IndexError, ValueError):
-            clear_screen(0)
+            clear_screen()
             self.display_game_title()
             self.display_board()
             print(Fore.WHITE + Style.BRIGHT + "Starting Position: " + Fore.RED + Style.BRIGHT + "Invalid coordinates!")
+            pause()
             clear_screen()
             return self.get_starting_position()
 
     def create_valid_paths(self) -> None:
-        """Generate paths based on the starting position. Check the list for paths that are full. Remove them if they are."""
-        # Convert the coordinates of the starting position to zero-based numbering
-        x = self.starting_position[0]
-        y = self.starting_position[1]
-
-        # Create a list of three paths
-        path1 = []
-        path2 = []
-        path3 = []
-
-        # Get coordinates for each path starting at corners
-        # Starting position at top left corner
-        if (x, y) == (0, 0):
-            for i in range(self.length):
-                # Path to top right corner
-                path1 += [(0, i)]
-
-                # Path to bottom right corner
-                path2 += [(i, i)]
-
-                # Path to bottom left corner
-                path3 += [(i, 0)]
-
-        # Starting position at top right corner
-        elif (x, y) == (0, self.length - 1):
-            for i in range(self.length):
-                # Path to top left corner
-                path1 += [(0, self.length - 1 - i)]
+        """Look up the paths from the starting position. Remove the paths that are full."""
+        table = get_path_table(self.length)
+        paths = table.paths.get(self.starting_position)
 
-                # Path to bottom left corner
-                path2 += [(i, self.length - 1 - i)]
-
-                # Path to bottom right corner
-                path3 += [(i, self.length - 1)]
-
-        # Starting position at bottom left corner
-        elif (x, y) == (self.length - 1, 0):
-            for i in range(self.length):
-                # Path to top left corner
-                path1 += [(self.length - 1 - i, 0)]
-
-                # Path to top right corner
-                path2 += [(self.length - 1 - i, i)]
-
-                # Path to bottom right corner
-                path3 += [(self.length - 1, i)]
-
-        # Starting position at bottom right corner
-        elif (x, y) == (self.length - 1, self.length - 1):
-            for i in range(self.length):
-
-                # Path to top right corner
-                path1 += [(i, self.length - 1)]
-
-                # Path to top left corner
-                path2 += [(i, i)]
-
-                # Path to bottom left corner
-                path3 += [(self.length - 1, i)]
-
-            # Reverse any path that may needs be
-            path1.reverse()
-            path2.reverse()
-            path3.reverse()
-
-        # Get coordinates for each path starting at edges
-        else:
-            # Starting position at top edge
-            if x == 0:
-                # Path to left edge
-                temp_x = x
-                temp_y = y
-
-                while temp_y >= 0:
-                    path1 += [(temp_x, temp_y)]
-                    temp_x += 1
-                    temp_y -= 1
-
-                # Path to bottom edge
-                for i in range(self.length):
-                    path2 += [(i, y)]
-
-                # Path to right edge
-                temp_x = x
-                temp_y = y
-
-                while temp_y < self.length:
-                    path3 += [(temp_x, temp_y)]
-                    temp_x += 1
-                    temp_y += 1
-
-            # Starting position at left edge
-            elif y == 0:
-                # Path to top edge
-                temp_x = x
-                temp_y = y
-
-                while temp_x >= 0:
-                    path1 += [(temp_x, temp_y)]
-                    temp_x -= 1
-                    temp_y += 1
-
-                # Path to right edge
-                for i in range(self.length):
-                    path2 += [(x, i)]
-
-                # Path to bottom edge
-                temp_x = x
-                temp_y = y
-
-                while temp_x < self.length:
-                    path3 += [(temp_x, temp_y)]
-                    temp_x += 1
-                    temp_y += 1
-
-            # Starting position at right edge
-            elif y == self.length - 1:
-                # Path to top edge
-                temp_x = x
-                temp_y = y
-
-                while temp_x >= 0:
-                    path1 += [(temp_x, temp_y)]
-                    temp_x -= 1
-                    temp_y -= 1
-
-                # Path to left edge
-                for i in range(self.length):
-                    path2 += [(x, i)]
-
-                # Path to bottom edge
-                temp_x = x
-                temp_y = y
-
-                while temp_x < self.length:
-                    path3 += [(temp_x, temp_y)]
-                    temp_x += 1
-                    temp_y -= 1
-
-                # Reverse any path that may needs be
-                path2.reverse()
-
-            # case of starting point on the bottom edge
-            elif x == self.length - 1:
-                # Path to left edge
-                temp_x = x
-                temp_y = y
-
-                while temp_y >= 0:
-                    path1 += [(temp_x, temp_y)]
-                    temp_x -= 1
-                    temp_y -= 1
-
-                # Path to top edge
-                for i in range(self.length):
-                    path2 += [(i, y)]
-
-                # Path to right edge
-                temp_x = x
-                temp_y = y
-
-                while temp_y < self.length:
-                    path3 += [(temp_x, temp_y)]
-                    temp_x -= 1
-                    temp_y += 1
-
-                # Reverse any path that may needs be
-                path2.reverse()
-
-        self.paths = [path1, path2, path3]
-        self.paths_full = [path1, path2, path3]
-
-        # Create a list of strings for each path
-        path1_res = []
-        path2_res = []
-        path3_res = []
-
-        # Checking if the paths are full if they do not contain an empty string
-        for coord in self.paths[0]:
-            if " " in self.matrix[coord]:
-                path1_res.append(self.matrix[coord])
-        for coord in self.paths[1]:
-            if " " in self.matrix[coord]:
-                path2_res.append(self.matrix[coord])
-        for coord in self.paths[2]:
-            if " " in self.matrix[coord]:
-                path3_res.append(self.matrix[coord])
-
-        try:
-            if not path1_res:
-                self.paths.pop(0)
-            if not path2_res:
-                self.paths.pop(-2)
-            if not path3_res:
-                self.paths.pop(1)
-        except IndexError:
+        # A starting position that is not on an edge has no paths
+        if paths is None:
             self.paths = []
+            self.paths_full = []
+            return
+
+        # A path is full when every bit of its mask is set in the occupancy bitmask
+        self.paths = [path for path, mask in zip(paths, table.masks[self.starting_position]) if not self.core.is_path_full(mask)]
+        self.paths_full = paths
 
     def get_selected_path(self) -> int:
         """Get selected path from player"""
@@ -1414,17 +2755,19 @@ class Board:
                     self.selected_path = self.paths[user_input - 1]
                     self.display_selected_path()
                 else:
-                    clear_screen(0)
+                    clear_screen()
                     self.display_game_title()
                     self.display_board(temp_board, temp_colour_map)
                     print(Fore.WHITE + Style.BRIGHT + "Type path number: " + Fore.RED + Style.BRIGHT + "Invalid path number!")
+                    pause()
                     clear_screen()
                     return self.get_selected_path()
             except ValueError:
-                clear_screen(0)
+                clear_screen()
                 self.display_game_title()
                 self.display_board(temp_board, temp_colour_map)
                 print(Fore.WHITE + Style.BRIGHT + "Type path number: " + Fore.RED + Style.BRIGHT + "Invalid path number!")
+                pause()
                 clear_screen()
                 return self.get_selected_path()
 
@@ -1446,7 +2789,8 @@ class Board:
         temp_colour_map[self.starting_position] = "YELLOW"
 
         # Print the board
-        clear_screen(time)
+        pause(time)
+        clear_screen()
         self.display_game_title(False, False, False, True)
         self.display_board(temp_board, temp_colour_map)
 
@@ -1481,23 +2825,17 @@ class Board:
 
     def display_board(self, board=None, colour_map=None, get_str_board=False, computer_player=False) -> int:
         """Display the board."""
-        def chunks(data: Dict[Tuple[int, int], str], SIZE=10000) -> Generator[Dict[Tuple[int, int], str], any, None]:
-            """Divide the data into chunks."""
-            itt = iter(data)
-
-            for i in range(0, len(data), SIZE):
-                yield {k: data[k] for k in it.islice(itt, SIZE)}
-
         if colour_map is None:
             colour_map = self.colour_map
 
         if board is None:
             board = self.matrix
 
-        # Colour the previous word placed by the player
-        if self.previous_selected_path is not None:
-            for key in self.colour_map:
-                self.colour_map[key] = "WHITE"
+        # Colour the previous word placed by the player, only the squares coloured by the last highlight are reset
+        if self.previous_selected_path is not None and self.highlight != (self.previous_selected_path, computer_player):
+            if self.highlight is not None:
+                for coord in self.highlight[0]:
+                    self.colour_map[coord] = "WHITE"
 
             for coord in self.previous_selected_path:
                 self.colour_map[coord] = "CYAN"
@@ -1508,87 +2846,554 @@ class Board:
             if computer_player:
                 self.colour_map[self.previous_selected_path[0]] = "YELLOW"
 
-        # Create a list of chunks
-        chunks_list = []
+            self.highlight = (list(self.previous_selected_path), computer_player)
 
-        # Create chunks of the colour map and store them in the chunks list
-        for item in chunks(colour_map, self.length):
-            chunks_list.append(item)
+        # Assign each letter to its corresponding colour depending on the coordinates, the rest of the frame is cached for each board length
+        skeleton = get_board_skeleton(self.length)
+        cell_starts = {colour: Fore.WHITE + "│" + getattr(Fore, colour) + " " for colour in set(colour_map.values())}
+        cell_end = " " + Fore.WHITE
+        letters = board.tolist()
+        str_board = skeleton.header + "".join(row_start + "".join([cell_starts[colour_map[row, column]] + letter + cell_end for column, letter in enumerate(letters[row])]) + row_end
+                                              for row, (row_start, row_end) in enumerate(zip(skeleton.row_starts, skeleton.row_ends))) + skeleton.footer
 
-        # Display the game board
-        if board is None:
-            board = self.matrix
+        if get_str_board:
+            return str_board
+        else:
+            print(f"\n{str_board}\n")
 
-        # Create representation of the board
-        str_board = Fore.WHITE + Style.BRIGHT + " "
-        str_board += "  "
+    def place_word(self, word: str, indices: Optional[np.ndarray] = None) -> None:
+        """Place the word onto the game board along the selected path, whose flat indices can be given if they are already known."""
+        if indices is None:
+            indices = get_path_indices(self.selected_path, self.length)
 
-        # Labelling top columns
-        for column_number in range(self.length):
-            if column_number < 9:
-                str_board += f"   {column_number + 1}"
-            else:
-                str_board += f"  {column_number + 1}"
+        # Letter i of the word goes onto the square of coordinate i of the path, the replaced squares are kept to undo the placement
+        squares = self.matrix.reshape(-1)
+        self.placements.append((indices, squares[indices], self.word, self.previous_selected_path))
+        squares[indices] = np.frombuffer(word.encode(REPLAY_CODEC), dtype="U1")[:len(indices)]
+        self.core.place(indices, word)
+        self.word = word
+        self.previous_selected_path = self.selected_path
+
+    def undo_word(self) -> None:
+        """Take back the last word placed onto the game board."""
+        indices, letters, self.word, self.previous_selected_path = self.placements.pop()
+        self.matrix.reshape(-1)[indices] = letters
+        self.core.undo()
+
+
+class ReplayState(NamedTuple):
+    """The details shown with the board after a number of turns of a replay."""
+    title: Tuple[bool, ...] # The arguments of Board.display_game_title for the event of the last turn
+    player: str # The current player
+    previous_player: Optional[str] # The player who placed the last word
+    word: Optional[str] # The last word placed
+    previous_selected_path: Optional[List[Tuple[int, int]]] # The coordinates of the last word placed
+    winner: Optional[str] # The winner of the game
+    draw: bool # Draw state
+    turn_counter: int # The number of words placed
+
+
+class ReplayEngine:
+    """Seek to any turn of a replay. The board is restored from the nearest snapshot, or kept, then only the words in between are placed or taken back."""
+    def __init__(self, replay: Replay, interval: int = REPLAY_SNAPSHOT_INTERVAL) -> None:
+        self.replay = replay # The replay being watched
+        self.interval = interval # The number of turns between the snapshots
+        self.board = Board() # The board after the current turn
+        self.indices = [] # The flat indices of the word placed by each turn, None when the turn placed no word
+        self.states = [] # The details shown after each number of turns
+        self.snapshots = [] # The letters and the core of the board every interval turns
+        self.turn = 0 # The number of turns played onto the board
+        self.base = 0 # The turn from which the placements of the board can be taken back
+
+        board = self.board
+        board.create_board(replay.board_length)
+        board.game_duration = replay.game_duration
+        board.players = replay.players
+        board.player = board.players[0]['name']
+
+        if board.players[0]['difficulty'] is not None:
+            board.player = f"{board.players[0]['name']} ({board.players[0]['difficulty']})"
+
+        board.game_counter = replay.game_number
+        self.states.append(self.get_state(()))
+        self.snapshots.append(self.take_snapshot())
+
+        # Play the game through once, the same way as it was watched turn by turn
+        for turn in replay.turns:
+            player_name = turn.player_name
+            board.player = player_name
+            indices = None
+            title = ()
+
+            if turn.type == "computer":
+                player_name = f"{turn.player_name} ({turn.difficulty})"
+
+            if turn.event == 'RESIGNED':
+                title = (False, False, True)
+            elif turn.event == 'WON':
+                board.winner = player_name
+                title = (False, True)
+            elif turn.event == 'PLAYING':
+                board.turn_counter += 1
+                board.selected_path = turn.selected_path
+                indices = get_path_indices(turn.selected_path, board.length)
+                board.place_word(turn.word, indices)
+                board.previous_player = player_name
+            elif turn.event == 'DRAW':
+                board.draw = True
+                title = (True,)
 
-        str_board +="\n    ┌───┬─"
+            self.indices.append(indices)
+            self.states.append(self.get_state(title))
+            self.turn += 1
 
-        for _ in range(self.length - 2):
-            str_board+= "──┬─"
+            if self.turn % interval == 0:
+                self.snapshots.append(self.take_snapshot())
 
-        str_board += "──┐\n"
+    def get_state(self, title: Tuple[bool, ...]) -> ReplayState:
+        """Record the details of the board shown with the current turn."""
+        board = self.board
+        return ReplayState(title, board.player, board.previous_player, board.word, board.previous_selected_path, board.winner, board.draw, board.turn_counter)
 
-        # Labelling left rows
-        lines = 0
+    def take_snapshot(self) -> Tuple[np.ndarray, BitBoard]:
+        """Copy the letters and the core of the board, without the undo history."""
+        core = self.board.core.copy()
+        core.history = []
+        return self.board.matrix.copy(), core
+
+    def seek(self, turn: int) -> None:
+        """Show the board after a number of turns, clamped to the length of the replay."""
+        turn = max(0, min(turn, len(self.replay.turns)))
+        snapshot = turn // self.interval
 
-        for chunk in chunks_list:
-            if chunks_list.index(chunk) < 9:
-                str_board += f"  {str(chunks_list.index(chunk) + 1)} "
-            else:
-                str_board += f" {str(chunks_list.index(chunk) + 1)} "
+        # Restore the nearest snapshot at or before the turn when the placements from the current turn cannot reach it sooner
+        if turn < self.base or turn - snapshot * self.interval < abs(turn - self.turn):
+            matrix, core = self.snapshots[snapshot]
+            self.board.matrix[...] = matrix
+            self.board.core = core.copy()
+            self.board.placements = []
+            self.turn = self.base = snapshot * self.interval
+
+        while self.turn < turn:
+            if self.indices[self.turn] is not None:
+                self.board.selected_path = self.replay.turns[self.turn].selected_path
+                self.board.place_word(self.replay.turns[self.turn].word, self.indices[self.turn])
+
+            self.turn += 1
+
+        while self.turn > turn:
+            self.turn -= 1
+
+            if self.indices[self.turn] is not None:
+                self.board.undo_word()
+
+        self.set_state(self.states[self.turn])
+
+    def set_state(self, state: ReplayState) -> None:
+        """Set the details of the board shown with the current turn."""
+        board = self.board
+        board.player, board.previous_player, board.word, board.previous_selected_path, board.winner, board.draw, board.turn_counter = state[1:]
+
+        # Before the first word there is no highlight, the squares of the last one are reset
+        if board.previous_selected_path is None and board.highlight is not None:
+            for coord in board.highlight[0]:
+                board.colour_map[coord] = "WHITE"
+
+            board.highlight = None
+
+    def render(self) -> str:
+        """Draw the game title and the board after the current turn."""
+        with redirect_stdout(io.StringIO()) as frame:
+            self.board.display_game_title(*self.states[self.turn].title)
+            self.board.display_board()
+
+        return frame.getvalue()
+
+
+def iter_replay_frames(replay: Replay) -> Iterator[str]:
+    """Draw the game title and the board after every turn of a replay, starting from the empty board."""
+    engine = ReplayEngine(replay)
+
+    for turn in range(len(replay.turns) + 1):
+        engine.seek(turn)
+        yield engine.render()
+
+
+@lru_cache(maxsize=None)
+def get_frame_font() -> Any:
+    """Load the monospace font of the PNG and GIF frames, it is shipped with matplotlib."""
+    return ImageFont.truetype(font_manager.findfont(font_manager.FontProperties(family="DejaVu Sans Mono", weight="bold")), FRAME_FONT_SIZE)
 
-            # Assign each string to its corresponding colour depending on the coordinates
-            for coord, colour in chunk.items():
-                set_colour = getattr(Fore, colour)
-                str_board += Fore.WHITE + "│" + set_colour + f" {board[coord]} " + Fore.WHITE
 
-            # Labelling right rows
-            str_board += f"│ {str(chunks_list.index(chunk) + 1)}\n    ├─"
+@lru_cache(maxsize=None)
+def get_frame_palette() -> List[int]:
+    """Blend the background into each colour of the PNG and GIF frames, FRAME_SHADES entries per colour."""
+    background = np.array(FRAME_BACKGROUND)
+    shades = np.linspace(0, 1, FRAME_SHADES)[:, None]
+    return np.concatenate([np.rint(background + shades * (np.array(colour) - background)) for colour in FRAME_COLOURS.values()]).astype(np.uint8).ravel().tolist()
 
-            for _ in range(self.length - 1):
-                str_board += "──┼─"
 
-            if lines < self.length - 1:
-                str_board += "──┤\n"
-                lines += 1
+@lru_cache(maxsize=None)
+def get_glyph(character: str) -> np.ndarray:
+    """Draw a character into a single cell of the PNG and GIF frames, as the shade of each pixel from 0 (background) to FRAME_SHADES - 1."""
+    font = get_frame_font()
+    ascent, descent = font.getmetrics()
+    image = Image.new("L", (int(font.getlength("M")), ascent + descent))
+    ImageDraw.Draw(image).text((0, 0), character, fill=255, font=font)
+    return ((np.asarray(image, dtype=np.uint16) * (FRAME_SHADES - 1) + 127) // 255).astype(np.uint8)
+
+
+def parse_frame(frame: str) -> List[List[Tuple[int, str, str]]]:
+    """Split each line of a frame into the column, the colour code and the text of each run of text of a single colour, as it would be shown on the console."""
+    lines = []
+    colour = Fore.WHITE
+
+    for line in frame.rstrip("\n").split("\n"):
+        cells = []
+        column = 0
+
+        # A carriage return writes the rest of the line over its start, as the bottom edge of the board does
+        for part in ANSI_ESCAPE.split(line):
+            if part in FRAME_COLOURS:
+                colour = part
+            elif part and not ANSI_ESCAPE.fullmatch(part):
+                for number, text in enumerate(part.split("\r")):
+                    column = 0 if number else column
+                    cells[column:column + len(text)] = [(colour, character) for character in text]
+                    column += len(text)
+
+        runs = []
+        column = 0
+
+        for cell_colour, group in it.groupby(cells, key=lambda cell: cell[0]):
+            text = "".join(character for _, character in group)
+            runs.append((column, cell_colour, text))
+            column += len(text)
+
+        lines.append(runs)
+
+    return lines
+
+
+def strip_frame(frame: str) -> str:
+    """Convert a frame into plain text, as it would be shown on the console."""
+    return "".join("".join(text for _, _, text in runs) + "\n" for runs in parse_frame(frame))
+
+
+def rasterise_frames(frames: List[str]) -> List[Any]:
+    """Draw frames as palette images of the same size, in the colours of the console."""
+    frames = [parse_frame(frame) for frame in frames]
+    characters = sorted({character for lines in frames for runs in lines for _, _, text in runs for character in text} | {" "})
+    glyph_codes = {character: code for code, character in enumerate(characters)}
+    colour_codes = {colour: code for code, colour in enumerate(FRAME_COLOURS)}
+    atlas = np.stack([get_glyph(character) for character in characters])
+    rows = max(len(lines) for lines in frames) + 2
+    columns = max([column + len(text) for lines in frames for runs in lines for column, _, text in runs] + [1]) + 2
+    _, glyph_height, glyph_width = atlas.shape
+    palette = get_frame_palette()
+    images = []
+
+    for lines in frames:
+        glyphs = np.full((rows, columns), glyph_codes[" "], dtype=np.intp)
+        colours = np.zeros((rows, columns), dtype=np.uint8)
+
+        for row, runs in enumerate(lines, 1):
+            for column, colour, text in runs:
+                glyphs[row, column + 1:column + 1 + len(text)] = [glyph_codes[character] for character in text]
+                colours[row, column + 1:column + 1 + len(text)] = colour_codes[colour]
+
+        # Each pixel indexes the palette by its colour and its shade, the cells are laid out from the glyph of each character
+        pixels = colours[:, :, None, None] * FRAME_SHADES + atlas[glyphs]
+        image = Image.fromarray(np.ascontiguousarray(pixels.transpose(0, 2, 1, 3)).reshape(rows * glyph_height, columns * glyph_width), "P")
+        image.putpalette(palette)
+        images.append(image)
+
+    return images
+
+
+def write_frames(frames: List[str], path: str, frame_format: str, frame_duration: float = 1) -> None:
+    """Write the frames of a replay as a folder of numbered files, or as a single animated GIF file next to the path."""
+    extension = FRAME_FORMATS[frame_format]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    if frame_format == "gif":
+        images = rasterise_frames(frames)
+        images[0].save(path + extension, save_all=True, append_images=images[1:], duration=int(frame_duration * 1000), loop=0)
+        return
+
+    os.makedirs(path, exist_ok=True)
+    images = rasterise_frames(frames) if frame_format == "png" else frames
+
+    for number, frame in enumerate(images):
+        file_path = os.path.join(path, f"frame_{number:04d}{extension}")
+
+        if frame_format == "png":
+            frame.save(file_path)
+        else:
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(strip_frame(frame) if frame_format == "text" else frame + Style.RESET_ALL)
+
+
+def export_replay_batch(directory: str, files: List[str], output_directory: str, frame_format: str, board_length: Optional[int] = None, frame_duration: float = 1) -> Tuple[int, List[Tuple[str, Optional[int]]]]:
+    """Export the frames of a batch of replay files. Return the number of frames of each file, 0 when it is another board size and None when it is corrupted or outdated."""
+    results = []
+
+    for file in files:
+        try:
+            replay = load_replay(os.path.join(directory, file))
+
+            if board_length is not None and replay.board_length != board_length:
+                results.append((file, 0))
+                continue
+
+            frames = list(iter_replay_frames(replay))
+        except REPLAY_ERRORS + (IndexError, TypeError):
+            results.append((file, None))
+            continue
+
+        write_frames(frames, os.path.join(output_directory, os.path.splitext(file)[0]), frame_format, frame_duration)
+        results.append((file, len(frames)))
+
+    return os.getpid(), results
+
+
+def export_replays(directory: str = LOCAL_DIR_REPLAYS, output_directory: str = LOCAL_DIR_FRAMES, frame_format: str = "text", board_length: Optional[int] = None,
+                   frame_duration: float = 1, workers: int = INGEST_WORKERS, chunk_size: int = EXPORT_CHUNK_SIZE) -> Tuple[IngestReport, int]:
+    """Export every frame of every replay file within a folder across a pool of processes. Return the report and the number of frames written."""
+    files = sorted(file for file in list_replay_files(directory) if file.endswith(REPLAY_FILE_FORMATS))
+    batches = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    report = IngestReport()
+    total_frames = 0
+    os.makedirs(output_directory, exist_ok=True)
+    arguments = (it.repeat(directory), batches, it.repeat(output_directory), it.repeat(frame_format), it.repeat(board_length), it.repeat(frame_duration))
+
+    # Starting the pool costs more than it saves for a single batch
+    if workers <= 1 or len(batches) <= 1:
+        results = map(export_replay_batch, *arguments)
+        executor = None
+    else:
+        executor = futures.ProcessPoolExecutor(max_workers=min(workers, len(batches)))
+        results = executor.map(export_replay_batch, *arguments)
+
+    try:
+        for worker, frame_counts in results:
+            for file, frames in frame_counts:
+                if frames is None:
+                    report.failures.setdefault(worker, []).append(file)
+                elif frames > 0:
+                    report.decoded += 1
+                    total_frames += frames
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return report, total_frames
+
+
+def write_output(rows: List[Dict[str, Any]], output: Optional[str], output_format: str) -> None:
+    """Write the rows produced by a command as JSON or CSV, either to a file or to the standard output."""
+    with instrumentation.stage("write") as stage:
+        stage.count = len(rows)
+        f = sys.stdout if output is None else open(output, "w", newline="", encoding="utf-8")
+
+        try:
+            if output_format == "json":
+                json.dump(rows, f, indent=2, default=str)
+                f.write("\n")
             else:
-                str_board += "\r"
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+                writer.writeheader()
+                writer.writerows({key: ", ".join(value) if isinstance(value, list) else value for key, value in row.items()} for row in rows)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+
+
+def profile_startup(count: int = STARTUP_PROFILE_COUNT) -> int:
+    """Import the program in a new interpreter with -X importtime and report the modules that took the longest. Return the exit code."""
+    name = os.path.splitext(os.path.basename(__file__))[0]
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        return result.returncode
+
+    # Each line is "import time: self [us] | cumulative | name", the name is indented by two spaces for each level of nesting
+    modules = []
+
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)", line)
+
+        if match:
+            modules.append((int(match.group(2)) / 1000, int(match.group(1)) / 1000, (len(match.group(3)) - 1) // 2, match.group(4)))
+
+    total = next((cumulative for cumulative, _, _, module in modules if module == name), sum(cumulative for cumulative, _, level, _ in modules if level == 0))
+    print(Fore.WHITE + Style.BRIGHT + f"{'Module':<48} {'Self (ms)':>10} {'Total (ms)':>11}")
+
+    for cumulative, self_time, _, module in sorted(modules, reverse=True)[:count]:
+        print(f"{module:<48} {self_time:>10.1f} {cumulative:>11.1f}")
+
+    print(Fore.WHITE + Style.BRIGHT + f"\nImporting {name} took {total:.1f} ms, starting the interpreter and importing it took {elapsed * 1000:.1f} ms")
+    return 0
+
+
+def run_command_line(arguments: List[str]) -> int:
+    """Run a single analysis without any interactive prompts. Return the exit code."""
+    commands = {"check": "check the board size, players, game mode and duration of every file",
+                "player-stats": "calculate the statistics of every player",
+                "letter-freq": "calculate the letter frequency",
+                "word-length": "calculate the word length frequency",
+                "heatmap": "calculate the square usage",
+                "convert": "convert every .wbr file into a .wbrb file",
+                "export": "export every frame of every replay as text, ANSI, PNG or GIF files",
+                "pack": "pack every replay file into a single .wbra archive"}
+    parser = argparse.ArgumentParser(prog=os.path.basename(sys.argv[0]), description=f"{__title__} v{__version__}. Run without a command for the interactive menu.")
+    parser.add_argument("--profile-startup", action="store_true", help="report the modules that take the longest to import when the program starts")
+    parser.add_argument("--profile", action="store_true", help=f"report the time spent in each stage of the command, also switched on by the {PROFILE_VARIABLE} environment variable")
+    parser.add_argument("--trace", metavar="FILE", help=f"write the stages of the command as a Chrome trace, also given by the {TRACE_VARIABLE} environment variable")
+    parser.add_argument("--sample", action="store_true", help=f"sample the call stack while the command runs and report the busiest functions, also switched on by the {SAMPLE_VARIABLE} environment variable")
+    subparsers = parser.add_subparsers(dest="command")
+
+    for command, description in commands.items():
+        subparser = subparsers.add_parser(command, help=description, description=description)
+        subparser.add_argument("--replays", default=LOCAL_DIR_REPLAYS, help="the folder of replay files (default: %(default)s)")
+        subparser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="the number of processes used to decode replay files (default: %(default)s)")
+
+        if command == "convert":
+            subparser.add_argument("--output", help="the folder to write the .wbrb files to, the .wbr files are replaced if omitted")
+            continue
+        elif command == "pack":
+            subparser.add_argument("--output", required=True, help="the archive file to write")
+            continue
+        elif command == "export":
+            subparser.add_argument("--board-size", type=int, help="only export games of this board size")
+            subparser.add_argument("--output", default=LOCAL_DIR_FRAMES, help="the folder to write a folder of frames or a GIF file of each replay to (default: %(default)s)")
+            subparser.add_argument("--format", choices=list(FRAME_FORMATS), default="text", help="the format of the frames (default: %(default)s)")
+            subparser.add_argument("--speed", type=float, default=1, help="the seconds each frame of a GIF file is shown for (default: %(default)s)")
+            continue
+
+        subparser.add_argument("--board-size", type=int, help="only analyse games of this board size")
+        subparser.add_argument("--output", help="the file to write to, the standard output is used if omitted")
+        subparser.add_argument("--format", choices=["json", "csv", "png"] if command in ("letter-freq", "word-length", "heatmap") else ["json", "csv"],
+                               help="the output format, taken from the output file extension if omitted (default: json)")
+
+        if command == "player-stats":
+            subparser.add_argument("--top", type=int, default=TOP_K, help="the number of most frequent words and letters of each player (default: %(default)s)")
+        elif command == "check":
+            subparser.add_argument("--game-mode", type=str.title, choices=GAME_MODES, help="only check games of this game mode, in quotes")
+        elif command == "heatmap":
+            subparser.add_argument("--annotations", action="store_true", help="annotate each square with its occupancy probability")
+
+    args = parser.parse_args(arguments)
+
+    if args.profile_startup:
+        return profile_startup()
+    elif args.command is None:
+        parser.error("a command is required")
+
+    # The reports are written to the standard error, so they do not mix with the output of the command
+    instrumentation.configure(args.profile, args.trace, args.sample)
+
+    with instrumentation.action(args.command):
+        if args.command == "convert":
+            report = convert_replays(args.replays, args.output, args.workers)
+            print(f"{report.decoded} files converted")
+            report.display()
+            return 0
+        elif args.command == "pack":
+            try:
+                print(f"{pack_replay_archive(args.replays, args.output)} files packed into {args.output}")
+            except FileNotFoundError:
+                print(f"Error: The folder {args.replays} cannot be found!", file=sys.stderr)
+                return 1
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 1
+
+            return 0
+        elif args.command == "export":
+            if args.format in ("png", "gif") and importlib.util.find_spec("PIL") is None:
+                parser.error(f"{args.format} output requires Pillow, install it with: pip install Pillow")
+
+            try:
+                report, frames = export_replays(args.replays, args.output, args.format, args.board_size, args.speed, args.workers)
+            except FileNotFoundError:
+                print(f"Error: The folder {args.replays} cannot be found!", file=sys.stderr)
+                return 1
+
+            print(f"{frames} frames of {report.decoded} files exported")
+            report.display()
+            return 0
+
+        output_format = args.format or (os.path.splitext(args.output)[1][1:].lower() if args.output else "json")
+
+        if output_format not in ("json", "csv", "png"):
+            parser.error(f"cannot infer the output format from {args.output}, use --format")
+        elif output_format == "png" and (args.output is None or args.command in ("check", "player-stats")):
+            parser.error("png output requires --output and a plotting command")
+
+        # The files skipped while reading the replays are reported on the standard error, so they do not mix with the output
+        report = IngestReport()
+
+        try:
+            list_replay_files(args.replays)
+
+            if args.command == "check":
+                rows = summarise_replay_files(args.replays, args.workers, args.board_size, args.game_mode, report)
+                write_output(rows, args.output, output_format)
+                report.display(sys.stderr)
+                return 0
+
+            elif args.command == "player-stats":
+                write_output(calculate_player_statistics(load_player_statistics(args.replays, args.workers, report), args.board_size, args.top), args.output, output_format)
+                report.display(sys.stderr)
+                return 0
+        except FileNotFoundError:
+            print(f"Error: The folder {args.replays} cannot be found!", file=sys.stderr)
+            return 1
+
+        if output_format == "png":
+            plt.switch_backend("Agg")
 
-        # Labelling bottom columns
-        str_board +="    └───┴─"
+        tables = iter_turns(iter_games(args.replays, args.board_size, args.workers, report))
 
-        for _ in range(self.length - 2):
-            str_board+= "──┴─"
+        if args.command == "letter-freq":
+            letter_frequency = calculate_letter_frequency(tables)
 
-        str_board += "──┘\n   "
+            if output_format == "png":
+                fig = plot_letter_frequency(letter_frequency)
 
-        for column_number in range(self.length):
-            if column_number < 9:
-                str_board += f"   {column_number + 1}"
+                with instrumentation.stage("write"):
+                    fig.savefig(args.output)
             else:
-                str_board += f"  {column_number + 1}"
+                write_output([{"letter": letter, "frequency": frequency} for letter, frequency in sort_dict_by_values(letter_frequency)], args.output, output_format)
+        elif args.command == "word-length":
+            word_length_frequency = calculate_word_length_frequency(tables)
 
-        if get_str_board:
-            return str_board
-        else:
-            print(f"\n{str_board}\n")
+            if output_format == "png":
+                fig = plot_word_length_frequency(word_length_frequency)
 
-    def place_word(self, word: str) -> None:
-        """Place the word onto the game board."""
-        self.word = word
-        self.previous_selected_path = self.selected_path
+                with instrumentation.stage("write"):
+                    fig.savefig(args.output)
+            else:
+                write_output([{"word_length": length, "frequency": frequency} for length, frequency in sort_dict_by_keys(word_length_frequency)], args.output, output_format)
+        elif args.command == "heatmap":
+            usage = calculate_square_usage(tables)
+
+            if output_format == "png":
+                fig = plot_square_usage(usage, args.annotations)
+
+                with instrumentation.stage("write"):
+                    fig.savefig(args.output)
+            else:
+                write_output([{"board_size": board_length, "row": int(row) + 1, "column": int(column) + 1, "count": int(grid[row, column])}
+                              for board_length, grid in usage.items() for row, column in zip(*np.nonzero(grid))], args.output, output_format)
+
+        report.display(sys.stderr)
+        return 0
 
-        for coord in self.previous_selected_path:
-            self.matrix[coord] = self.word[self.previous_selected_path.index(coord)]
 
 def main():
     """The program."""
@@ -1604,9 +3409,12 @@ def main():
     kernel32 = ctypes.windll.kernel32
     kernel32.SetConsoleMode(kernel32.GetStdHandle(-10), 128)
 
+    # Let the console draw the colours and redraw the screen in place, this was a side effect of the 'cls' subprocess
+    kernel32.SetConsoleMode(kernel32.GetStdHandle(-11), CONSOLE_OUTPUT_MODE)
+
     # Run main menu
     while True:
-        clear_screen(0)
+        clear_screen()
         print(Fore.WHITE + Style.BRIGHT + f"{'-' * 32}\n{__title__} v{__version__}\nWritten in Python {PY_VERSION}\nDeveloped by {__author__}\n{'-' * 32}")
         print("Consult the README file on how to use this program.\n")
 
@@ -1617,25 +3425,32 @@ def main():
 
         selection = input("\nSelection: ")
 
-        if selection == "1":
-            check_files()
-        elif selection == "2":
-            display_player_statistics()
-        elif selection == "3":
-            display_letter_frequency_bar_graph()
-        elif selection == "4":
-            display_word_length_frequency_bar_graph()
-        elif selection == "5":
-            display_square_usage_heatmap()
-        elif selection == "6":
-            clear_screen(0)
-            open_replay()
-        elif selection == "7":
-            check_if_file_exists('README.txt')
-            subprocess.call(['cmd', '/c', 'start', '/max', 'README.txt'])
-        elif selection == "8":
-            sys.exit(0)
+        # Each option is timed as an action of its own while the instrumentation is switched on
+        with instrumentation.action(menu_item[int(selection) - 1] if selection.isdigit() and 0 < int(selection) <= len(menu_item) else "Invalid selection"):
+            if selection == "1":
+                check_files()
+            elif selection == "2":
+                display_player_statistics()
+            elif selection == "3":
+                display_letter_frequency_bar_graph()
+            elif selection == "4":
+                display_word_length_frequency_bar_graph()
+            elif selection == "5":
+                display_square_usage_heatmap()
+            elif selection == "6":
+                clear_screen()
+                open_replay()
+            elif selection == "7":
+                check_if_file_exists('README.txt')
+                subprocess.call(['cmd', '/c', 'start', '/max', 'README.txt'])
+            elif selection == "8":
+                sys.exit(0)
 
 
 if __name__ == "__main__":
-    main()
+    instrumentation.configure_from_environment()
+
+    if len(sys.argv) > 1:
+        sys.exit(run_command_line(sys.argv[1:]))
+    else:
+        main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (C) Jordan Memphis Leef. All Rights Reserved.
+# View the LICENSE.md on GitHub
+
+from typing import List, Dict, Tuple, Callable, Any, Optional
+import datetime
+import argparse
+import platform
+import tempfile
+import random
+import json
+import time
+import ast
+import sys
+import os
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import numpy as np
+
+import Word_Battle_Analytic_Tool as wbat
+
+
+def legacy_decode(raw: bytes) -> list:
+    """Decode a .wbr file the way the menu actions did before the shared decoder."""
+    bytes_data = raw.decode().splitlines()
+    data = ast.literal_eval("".join(map(chr, [int(i) for i in bytes_data])))
+    wbr_content = {"wbr_game_info": data}
+    replay_info = json.dumps(wbr_content, indent=7)
+    return json.loads(replay_info)['wbr_game_info']
+
+
+def legacy_word_strength(word: str) -> int:
+    """Calculate the strength of a word the way it was before the batch word strengths, a word with a character that is not a letter has a strength of 0."""
+    total = 0
+
+    try:
+        for letter in word:
+            total += wbat.LETTER_VALUE[letter]
+    except KeyError:
+        return 0
+
+    return total
+
+
+def read_replays(directory: str) -> List[bytes]:
+    """Read the raw contents of every replay file in a directory."""
+    payloads = []
+
+    for file in sorted(os.listdir(directory)):
+        if file.endswith(wbat.REPLAY_FILE_FORMAT):
+            with open(os.path.join(directory, file), "rb") as f:
+                payloads.append(f.read())
+
+    return payloads
+
+
+def time_decoder(decoder, payloads: List[bytes], repeat: int) -> Tuple[float, int]:
+    """Time the best of several runs of a decoder over every payload."""
+    best = None
+    games = 0
+
+    for _ in range(repeat):
+        games = 0
+        start = time.perf_counter()
+
+        for raw in payloads:
+            try:
+                decoder(raw)
+                games += 1
+            except wbat.REPLAY_ERRORS:
+                pass
+
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best, games
+
+
+def benchmark_decode(directory: str, repeat: int) -> None:
+    """Report the decode throughput of the legacy and shared decoders."""
+    payloads = read_replays(directory)
+    total_bytes = sum(len(raw) for raw in payloads)
+
+    if not payloads:
+        print(f"No {wbat.REPLAY_FILE_FORMAT} files found in {directory}")
+        return
+
+    print(f"{len(payloads)} files, {total_bytes / 1e6:.2f} MB, best of {repeat}\n")
+
+    for name, decoder in (("legacy", legacy_decode), ("decode_replay", wbat.decode_replay)):
+        elapsed, games = time_decoder(decoder, payloads, repeat)
+        print(f"{name:<16} {elapsed:8.3f} s | {total_bytes / 1e6 / elapsed:8.2f} MB/s | {games / elapsed:10.1f} games/s")
+
+    # The same games in the binary replay format, throughput is measured against the size of the .wbr files
+    binary_payloads = []
+
+    for raw in payloads:
+        try:
+            binary_payloads.append(wbat.encode_binary_replay(wbat.decode_replay(raw)))
+        except wbat.REPLAY_ERRORS:
+            pass
+
+    elapsed, games = time_decoder(wbat.decode_binary_replay, binary_payloads, repeat)
+    binary_bytes = sum(len(raw) for raw in binary_payloads)
+    print(f"{'binary':<16} {elapsed:8.3f} s | {total_bytes / 1e6 / elapsed:8.2f} MB/s | {games / elapsed:10.1f} games/s | {binary_bytes / 1e6:.2f} MB on disk")
+
+
+def benchmark_ingest(directory: str, max_workers: int, chunk_size: int) -> None:
+    """Report how the decode throughput of the ingestion pool scales with its worker count."""
+    files = sorted(file for file in os.listdir(directory) if file.endswith(wbat.REPLAY_FILE_FORMAT))
+    worker_counts = sorted({1, max_workers} | {2 ** i for i in range(max_workers.bit_length()) if 2 ** i <= max_workers})
+    baseline = None
+    report = None
+
+    if not files:
+        print(f"No {wbat.REPLAY_FILE_FORMAT} files found in {directory}")
+        return
+
+    print(f"{len(files)} files, chunks of {chunk_size}\n")
+
+    for workers in worker_counts:
+        report = wbat.IngestReport()
+        start = time.perf_counter()
+
+        for _ in wbat.ingest_replays(directory, files, report, workers, chunk_size):
+            pass
+
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>3} worker(s) {elapsed:8.3f} s | {len(files) / elapsed:10.1f} files/s | speedup {baseline / elapsed:5.2f}x")
+
+    report.display()
+
+
+def benchmark_archive(directory: str, repeat: int) -> None:
+    """Report the load throughput of replay files on their own and packed into a replay archive."""
+    files = sorted(file for file in os.listdir(directory) if file.endswith(wbat.REPLAY_FILE_FORMATS))
+
+    if not files:
+        print(f"No replay files found in {directory}")
+        return
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        archive = os.path.join(temporary_directory, "replays" + wbat.ARCHIVE_FILE_FORMAT)
+        start = time.perf_counter()
+        wbat.pack_replay_archive(directory, archive)
+        print(f"{len(files)} files packed in {time.perf_counter() - start:.3f} s, best of {repeat}\n")
+
+        for name, paths in (("files", [os.path.join(directory, file) for file in files]), ("archive", [f"{archive}/{file}" for file in files])):
+            best = None
+
+            for _ in range(repeat):
+                games = 0
+                start = time.perf_counter()
+
+                for path in paths:
+                    try:
+                        wbat.load_replay(path)
+                        games += 1
+                    except wbat.REPLAY_ERRORS:
+                        pass
+
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            print(f"{name:<16} {best:8.3f} s | {games / best:10.1f} games/s")
+
+        # The archive stays mapped by the cache until it is dropped
+        wbat.get_replay_archive.cache_clear()
+
+
+HUMAN_PLAYER_NAMES = ["Alice", "Bob", "Charlie", "Dana", "Eve", "Frank", "Grace", "Heidi"] # The names the synthetic human players are drawn from
+COMPUTER_DIFFICULTIES = ["Easy", "Medium", "Hard"] # The difficulties the synthetic computer players are drawn from
+RESIGN_PROBABILITY = 0.02 # The chance of a synthetic player resigning instead of taking their turn
+
+
+def generate_replay(game_number: int, board_length: int, rng: random.Random) -> wbat.Replay:
+    """Play a synthetic game of random words along random legal paths until the board is full or every player but one has resigned."""
+    letters = list(wbat.LETTER_VALUE)
+    players = [(name, "human", None) for name in rng.sample(HUMAN_PLAYER_NAMES, rng.randint(1, 3))]
+
+    # At most one computer player, as the game has only one
+    if rng.random() < 0.5 or len(players) == 1:
+        players.insert(rng.randrange(len(players) + 1), (wbat.COMPUTER_PLAYER_NAME, "computer", rng.choice(COMPUTER_DIFFICULTIES)))
+
+    board = wbat.Board()
+    board.create_board(board_length)
+    starting_positions = list(wbat.get_path_table(board_length).paths)
+    turns = []
+    player = 0
+
+    # The paths are looked up the way the game does, so a full path is never chosen
+    while len(players) > 1:
+        player_name, player_type, difficulty = players[player]
+
+        if rng.random() < RESIGN_PROBABILITY:
+            turns.append(wbat.Turn(player_name, player_type, difficulty, "RESIGNED", None, None))
+            del players[player]
+            player %= len(players)
+            continue
+
+        board.starting_position = rng.choice(starting_positions)
+        board.create_valid_paths()
+
+        if not board.paths:
+            continue
+
+        board.selected_path = rng.choice(board.paths)
+        word = "".join(rng.choices(letters, k=len(board.selected_path)))
+        board.place_word(word)
+        turns.append(wbat.Turn(player_name, player_type, difficulty, "PLAYING", word, board.selected_path))
+        player = (player + 1) % len(players)
+
+        if board.core.is_full():
+            player_name, player_type, difficulty = players[player]
+            turns.append(wbat.Turn(player_name, player_type, difficulty, "DRAW", None, None))
+            break
+    else:
+        player_name, player_type, difficulty = players[0]
+        turns.append(wbat.Turn(player_name, player_type, difficulty, "WON", None, None))
+
+    return wbat.Replay(game_number, board_length, str(datetime.timedelta(seconds=sum(rng.randint(2, 30) for _ in turns))), turns)
+
+
+def generate_replays(directory: str, games: int, board_length: Optional[int] = None, seed: int = 0, binary: bool = False) -> List[str]:
+    """Write a corpus of synthetic replay files, the same seed always writes the same files. The board lengths are random if omitted."""
+    os.makedirs(directory, exist_ok=True)
+    files = []
+
+    for game_number in range(1, games + 1):
+        # Each game has a generator of its own, so a larger corpus starts with the games of a smaller one
+        rng = random.Random(f"{seed}-{game_number}")
+        replay = generate_replay(game_number, board_length or rng.randint(wbat.LOWER_LIMIT, wbat.UPPER_LIMIT), rng)
+        file = f"game{game_number}" + (wbat.BINARY_REPLAY_FILE_FORMAT if binary else wbat.REPLAY_FILE_FORMAT)
+
+        with open(os.path.join(directory, file), "wb") as f:
+            f.write(wbat.encode_binary_replay(replay) if binary else wbat.encode_replay(replay))
+
+        files.append(file)
+
+    return files
+
+
+def get_peak_rss() -> Tuple[Optional[int], Optional[int]]:
+    """The peak resident set size in bytes of the benchmark and of its largest finished worker process, None where it cannot be read."""
+    if resource is None:
+        return None, None
+
+    # ru_maxrss is in kilobytes, except on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+
+
+def time_stage(stage: str, action: Callable[[], Any], items: int, unit: str, repeat: int) -> Dict[str, Any]:
+    """Time the best of several runs of a stage and record its throughput and the peak memory so far."""
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    peak_rss, peak_rss_workers = get_peak_rss()
+    result = {"stage": stage, "seconds": best, "items": items, "unit": unit, "throughput": items / best if best else None, "peak_rss": peak_rss, "peak_rss_workers": peak_rss_workers}
+    rss = "n/a" if peak_rss is None else f"{peak_rss / 1e6:.1f} MB"
+    print(f"{stage:<16} {best:8.3f} s | {result['throughput'] or 0:12.1f} {unit}/s | peak RSS {rss}")
+    return result
+
+
+def draw_figure(fig: Any) -> None:
+    """Render a figure off screen and close it, in place of showing it."""
+    fig.canvas.draw()
+    wbat.plt.close(fig)
+
+
+def benchmark_suite(games: int, board_length: Optional[int], repeat: int, workers: int, seed: int = 0, output: Optional[str] = None, baseline: Optional[str] = None) -> None:
+    """Time every hot path of the tool over a synthetic corpus: decoding, each menu analytic, drawing the board and stepping through replays."""
+    results = []
+    wbat.plt.switch_backend("Agg")
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{games} synthetic games, board size {board_length or 'random'}, seed {seed}, best of {repeat}\n")
+        start = time.perf_counter()
+        files = generate_replays(directory, games, board_length, seed)
+        print(f"{'generate':<16} {time.perf_counter() - start:8.3f} s")
+        paths = [os.path.join(directory, file) for file in files]
+        replays = [wbat.load_replay(path) for path in paths]
+        turns = sum(len(replay.turns) for replay in replays)
+
+        results.append(time_stage("decode", lambda: [wbat.load_replay(path) for path in paths], games, "games", repeat))
+
+        # The first analysis builds the index, every later one reads from it
+        def build_index() -> None:
+            os.remove(os.path.join(directory, wbat.REPLAY_INDEX_FILE))
+
+            with wbat.ReplayIndex(directory) as index:
+                index.update(workers)
+
+        with wbat.ReplayIndex(directory):
+            pass
+
+        results.append(time_stage("index", build_index, games, "games", repeat))
+        results.append(time_stage("check", lambda: wbat.summarise_replay_files(directory, workers), games, "games", repeat))
+        results.append(time_stage("player-stats", lambda: wbat.calculate_player_statistics(wbat.load_player_statistics(directory, workers)), games, "games", repeat))
+        results.append(time_stage("letter-freq", lambda: draw_figure(wbat.plot_letter_frequency(wbat.calculate_letter_frequency(wbat.iter_turns(wbat.iter_games(directory, None, workers))))), games, "games", repeat))
+        results.append(time_stage("word-length", lambda: draw_figure(wbat.plot_word_length_frequency(wbat.calculate_word_length_frequency(wbat.iter_turns(wbat.iter_games(directory, None, workers))))), games, "games", repeat))
+        results.append(time_stage("heatmap", lambda: draw_figure(wbat.plot_square_usage(wbat.calculate_square_usage(wbat.iter_turns(wbat.iter_games(directory, None, workers))))), games, "games", repeat))
+
+    # Every turn of every game is drawn once and stepped through forwards and backwards
+    engines = [wbat.ReplayEngine(replay) for replay in replays]
+
+    def draw_boards() -> None:
+        for engine in engines:
+            for _ in range(len(engine.replay.turns) + 1):
+                engine.board.display_board(get_str_board=True)
+
+    def step_replays() -> None:
+        for engine in engines:
+            for turn in range(len(engine.replay.turns) + 1):
+                engine.seek(turn)
+
+            for turn in reversed(range(len(engine.replay.turns))):
+                engine.seek(turn)
+
+    results.append(time_stage("display_board", draw_boards, turns + games, "frames", repeat))
+    results.append(time_stage("replay", step_replays, 2 * turns, "turns", repeat))
+
+    if baseline is not None:
+        with open(baseline) as f:
+            previous = {result["stage"]: result for result in json.load(f)["stages"]}
+
+        print(f"\nCompared with {baseline}")
+
+        for result in results:
+            if result["stage"] in previous and previous[result["stage"]]["throughput"] and result["throughput"]:
+                print(f"{result['stage']:<16} {result['throughput'] / previous[result['stage']]['throughput']:6.2f}x")
+
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump({"version": wbat.__version__, "python": platform.python_version(), "platform": platform.platform(), "games": games, "turns": turns,
+                       "board_length": board_length, "seed": seed, "repeat": repeat, "workers": workers, "stages": results}, f, indent=4)
+
+        print(f"\nResults written to {output}")
+
+
+def benchmark_statistics(players: int, words: int, k: int, vocabulary_size: int = 50000, seed: int = 0) -> None:
+    """Report the throughput of the player aggregates and of their top-k over synthetic words."""
+    rng = np.random.default_rng(seed)
+    random.seed(seed)
+    letters = list(wbat.LETTER_VALUE)
+    vocabulary = sorted({"".join(random.choices(letters, k=random.randint(wbat.LOWER_LIMIT - 1, wbat.UPPER_LIMIT))) for _ in range(vocabulary_size)})
+    turns = [wbat.Turn("", "human", None, "PLAYING", word, None) for word in vocabulary]
+    statistics = wbat.PlayerStatistics()
+    statistics.players = {f"Player {i}": wbat.PlayerAggregate(f"Player {i}", "human", None, ("", i)) for i in range(players)}
+    aggregates = list(statistics.players.values())
+    print(f"{players} players, {words} words, {len(vocabulary)} distinct words, top {k}\n")
+
+    # Words are drawn from a Zipf distribution so the counts have a long tail and plenty of ties
+    start = time.perf_counter()
+
+    for offset in range(0, words, 1000000):
+        size = min(1000000, words - offset)
+        owners = rng.integers(0, players, size).tolist()
+        codes = (np.minimum(rng.zipf(1.2, size), len(vocabulary)) - 1).tolist()
+
+        for owner, code in zip(owners, codes):
+            aggregates[owner].add_turn(turns[code])
+
+    elapsed = time.perf_counter() - start
+    print(f"{'aggregate':<16} {elapsed:8.3f} s | {words / elapsed:12.1f} words/s")
+
+    start = time.perf_counter()
+    result = [wbat.most_frequent(aggregate.words, k) for aggregate in aggregates]
+    elapsed = time.perf_counter() - start
+    print(f"{'top-k':<16} {elapsed:8.3f} s | {players / elapsed:12.1f} players/s")
+
+    # The previous approach, a full sort of the counts of every player
+    start = time.perf_counter()
+    expected = [[word for word, _ in sorted(aggregate.words.items(), key=lambda item: (-item[1], item[0]))[:k]] for aggregate in aggregates]
+    elapsed = time.perf_counter() - start
+    print(f"{'full sort':<16} {elapsed:8.3f} s | {players / elapsed:12.1f} players/s")
+
+    start = time.perf_counter()
+    statistics.statistics(k)
+    elapsed = time.perf_counter() - start
+    print(f"{'statistics':<16} {elapsed:8.3f} s | {players / elapsed:12.1f} players/s")
+
+    if result != expected:
+        print("Warning: the top-k and the full sort disagree")
+
+
+def benchmark_strength(words: int, repeat: int, seed: int = 0) -> None:
+    """Report the throughput of scoring synthetic words one at a time and all at once."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(wbat.LOWER_LIMIT - 1, wbat.UPPER_LIMIT + 1, words)
+    letters = np.frombuffer("".join(wbat.LETTER_VALUE).encode(), dtype=np.uint8)
+    buffer = letters[rng.integers(0, len(letters), lengths.sum())]
+
+    # One word in a thousand has a lower case letter, which is not a valid letter
+    buffer[rng.integers(0, len(buffer), words // 1000)] = ord("a")
+    text = buffer.tobytes().decode("ascii")
+    ends = np.cumsum(lengths).tolist()
+    word_list = [text[start:end] for start, end in zip([0] + ends[:-1], ends)]
+    print(f"{words} words, best of {repeat}\n")
+
+    for name, action in (("one at a time", lambda: [legacy_word_strength(word) for word in word_list]), ("all at once", lambda: wbat.calculate_word_strengths(word_list))):
+        best = None
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            action()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        print(f"{name:<16} {best:8.3f} s | {words / best:12.1f} words/s")
+
+    strengths, invalid = wbat.calculate_word_strengths(word_list)
+    expected = np.array([legacy_word_strength(word) for word in word_list])
+
+    # The legacy strength of a word with an invalid character is 0, the batch strength only leaves the character out
+    if (strengths[~invalid] != expected[~invalid]).any() or (expected[invalid] != 0).any():
+        print("Warning: the strengths one at a time and all at once disagree")
+
+    print(f"\n{int(invalid.sum())} words flagged as invalid")
+
+
+def benchmark_heatmap(placements: int, repeat: int, seed: int = 0) -> None:
+    """Report the throughput of counting synthetic coordinates into the square usage grids."""
+    rng = np.random.default_rng(seed)
+    board_lengths = rng.integers(wbat.LOWER_LIMIT, wbat.UPPER_LIMIT + 1, placements)
+    rows = rng.integers(0, wbat.UPPER_LIMIT, placements) % board_lengths
+    columns = rng.integers(0, wbat.UPPER_LIMIT, placements) % board_lengths
+    print(f"{placements} placements over board sizes {wbat.LOWER_LIMIT} to {wbat.UPPER_LIMIT}, best of {repeat}\n")
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        wbat.count_squares(board_lengths, rows, columns)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{'count_squares':<16} {best:8.3f} s | {placements / best:12.1f} placements/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"Benchmarks for the {wbat.__title__}")
+    parser.add_argument("--replays", default=wbat.LOCAL_DIR_REPLAYS, help="the folder of replay files to decode")
+    parser.add_argument("--repeat", type=int, default=3, help="the number of timed runs, the best run is reported")
+    parser.add_argument("--ingest", action="store_true", help="benchmark the ingestion pool instead of a single decoder")
+    parser.add_argument("--workers", type=int, default=wbat.INGEST_WORKERS, help="the largest worker count benchmarked by --ingest")
+    parser.add_argument("--chunk-size", type=int, default=wbat.INGEST_CHUNK_SIZE, help="the number of files decoded by a worker at a time")
+    parser.add_argument("--archive", action="store_true", help="benchmark loading the replay files on their own and from a replay archive instead")
+    parser.add_argument("--suite", action="store_true", help="benchmark every hot path over a synthetic corpus instead")
+    parser.add_argument("--generate", action="store_true", help="write a synthetic corpus into the --replays folder instead")
+    parser.add_argument("--games", type=int, default=1000, help="the number of synthetic games of --suite and --generate")
+    parser.add_argument("--board-length", type=int, help="the board length of the synthetic games, random if omitted")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the synthetic games, the same seed always gives the same games")
+    parser.add_argument("--binary", action="store_true", help="write .wbrb files with --generate instead of .wbr files")
+    parser.add_argument("--output", help="the JSON file --suite writes its results to")
+    parser.add_argument("--baseline", help="a JSON file written by an earlier --suite run to compare the throughput with")
+    parser.add_argument("--statistics", action="store_true", help="benchmark the player statistics over synthetic words instead")
+    parser.add_argument("--players", type=int, default=10000, help="the number of synthetic players benchmarked by --statistics")
+    parser.add_argument("--words", type=int, default=10000000, help="the number of synthetic words benchmarked by --statistics")
+    parser.add_argument("--top", type=int, default=wbat.TOP_K, help="the number of most frequent words found for each player by --statistics")
+    parser.add_argument("--strength", action="store_true", help="benchmark the word strengths over --words synthetic words instead")
+    parser.add_argument("--heatmap", action="store_true", help="benchmark the square usage grids over synthetic placements instead")
+    parser.add_argument("--placements", type=int, default=10000000, help="the number of synthetic placements benchmarked by --heatmap")
+    args = parser.parse_args()
+
+    if args.suite:
+        benchmark_suite(args.games, args.board_length, args.repeat, args.workers, args.seed, args.output, args.baseline)
+    elif args.generate:
+        print(f"{len(generate_replays(args.replays, args.games, args.board_length, args.seed, args.binary))} synthetic replay files written to {args.replays}")
+    elif args.archive:
+        benchmark_archive(args.replays, args.repeat)
+    elif args.strength:
+        benchmark_strength(args.words, args.repeat, args.seed)
+    elif args.heatmap:
+        benchmark_heatmap(args.placements, args.repeat)
+    elif args.statistics:
+        benchmark_statistics(args.players, args.words, args.top)
+    elif args.ingest:
+        benchmark_ingest(args.replays, args.workers, args.chunk_size)
+    else:
+        benchmark_decode(args.replays, args.repeat)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Copyright (C) Jordan Memphis Leef. All Rights Reserved.
+# View the LICENSE.md on GitHub
+
+import random
+import io
+import os
+
+import pytest
+
+import Word_Battle_Analytic_Tool as wbat
+import Word_Battle_Benchmark as benchmark
+
+
+def write_replay(path: str, replay: wbat.Replay) -> None:
+    """Write a replay as a .wbr file."""
+    with open(path, "wb") as f:
+        f.write(wbat.encode_replay(replay))
+
+
+def generate_games(count: int, seed: int = 0) -> list:
+    """Generate synthetic replays of random board sizes."""
+    rng = random.Random(seed)
+    return [benchmark.generate_replay(n + 1, rng.randint(wbat.LOWER_LIMIT, wbat.UPPER_LIMIT), rng) for n in range(count)]
+
+
+def test_binary_replay_round_trip():
+    for replay in generate_games(20):
+        for game_duration in (replay.game_duration, None, 12, 3.5, "é" * 300, (1, "2")):
+            replay.game_duration = game_duration
+            assert wbat.decode_binary_replay(wbat.encode_binary_replay(replay)) == replay
+
+
+def test_binary_replay_rejects_what_it_cannot_hold():
+    replay, = generate_games(1)
+    raw = wbat.encode_binary_replay(replay)
+
+    for end in range(len(raw)):
+        with pytest.raises(ValueError):
+            wbat.decode_binary_replay(raw[:end])
+
+    for game_number, game_duration in ((2 ** 32, None), (1, "x" * 2 ** 16)):
+        with pytest.raises(ValueError):
+            wbat.encode_binary_replay(wbat.Replay(game_number, replay.board_length, game_duration, replay.turns))
+
+
+def test_header_scanners_match_decode():
+    for replay in generate_games(20, seed=1):
+        expected = wbat.ReplayHeader(replay.game_number, replay.board_length, replay.game_duration, [(player["name"], player["type"]) for player in replay.players])
+        text = wbat.encode_replay(replay)
+        binary = wbat.encode_binary_replay(replay)
+
+        # Any block size has to give the same header, however the blocks cut the values
+        for block_size in (1, 7, 64, wbat.HEADER_SCAN_BLOCK_SIZE):
+            assert wbat.scan_replay_text(wbat.iter_replay_text(io.BytesIO(text), block_size)) == expected
+            assert wbat.scan_binary_replay(io.BytesIO(binary), block_size) == expected
+
+
+def test_header_scanners_reject_truncated_files():
+    replay, = generate_games(1, seed=2)
+    replay.game_duration = "é" * 100
+    text = wbat.encode_replay(replay)
+    binary = wbat.encode_binary_replay(replay)
+
+    # The header ends at the line of the first closing brace
+    header_end = text.index(b"\n%d\n" % ord("}")) + 1
+
+    for end in range(header_end + 1):
+        with pytest.raises(wbat.REPLAY_ERRORS):
+            wbat.scan_replay_text(wbat.iter_replay_text(io.BytesIO(text[:end]), 16))
+
+    for end in range(wbat.unpack_binary_header(memoryview(binary))[4]):
+        with pytest.raises(wbat.REPLAY_ERRORS):
+            wbat.scan_binary_replay(io.BytesIO(binary[:end]), 16)
+
+
+def test_player_statistics_removal_matches_rebuild():
+    rng = random.Random(0)
+    replays = [(f"game{n:03}.wbr", benchmark.generate_replay(n + 1, 5, rng)) for n in range(60)]
+    statistics = wbat.PlayerStatistics()
+
+    for file, replay in replays:
+        statistics.add_replay(file, replay)
+
+    # The latest games are removed, the earliest games are left to the replay index as the aggregates do not hold the games they count
+    for file, replay in replays[45:]:
+        statistics.add_replay(file, replay, -1)
+
+    rebuilt = wbat.PlayerStatistics()
+
+    for file, replay in reversed(replays[:45]):
+        rebuilt.add_replay(file, replay)
+
+    assert statistics.statistics() == rebuilt.statistics()
+    assert wbat.PlayerStatistics.from_json(statistics.to_json()).statistics() == rebuilt.statistics()
+
+    file, replay = replays[0]
+    statistics.add_replay(file, replay, -1)
+    assert all(statistics.players[player["name"]].first_seen is None for player in replay.players if player["name"] in statistics.players)
+
+
+def test_index_update_matches_rebuild(tmp_path):
+    directory = str(tmp_path)
+    files = sorted(benchmark.generate_replays(directory, 120, 5))
+    wbat.load_player_statistics(directory, workers=1)
+    rng = random.Random(1)
+
+    # The first games are removed, another game is replaced and new games are added
+    for file in files[:20]:
+        os.remove(os.path.join(directory, file))
+
+    write_replay(os.path.join(directory, files[40]), benchmark.generate_replay(1000, 5, rng))
+
+    for n in range(10):
+        write_replay(os.path.join(directory, f"new{n}.wbr"), benchmark.generate_replay(2000 + n, 5, rng))
+
+    updated = wbat.calculate_player_statistics(wbat.load_player_statistics(directory, workers=1))
+    os.remove(os.path.join(directory, wbat.REPLAY_INDEX_FILE))
+    assert updated == wbat.calculate_player_statistics(wbat.load_player_statistics(directory, workers=1))
+
+
+def test_check_stores_headers_in_index(tmp_path):
+    directory = str(tmp_path / "Replays")
+    benchmark.generate_replays(directory, 30)
+    benchmark.generate_replays(str(tmp_path / "binary"), 10, seed=1, binary=True)
+
+    for file in os.listdir(tmp_path / "binary"):
+        os.replace(tmp_path / "binary" / file, os.path.join(directory, "binary_" + file))
+
+    with open(os.path.join(directory, "corrupted.wbr"), "w") as f:
+        f.write("corrupted")
+
+    scanned = wbat.summarise_replay_files(directory, workers=1)
+
+    # The second check only reads the index, which agrees with both the header scan and a full decode
+    with wbat.ReplayIndex(directory) as index:
+        assert index.scan(headers_only=True)[1] == []
+
+    assert wbat.summarise_replay_files(directory, workers=1) == scanned
+    assert wbat.summarise_replay_files(directory, workers=1, board_length=7) == [summary for summary in scanned if summary["board_size"] == 7]
+    wbat.load_board_sizes(directory, workers=1)
+    assert wbat.summarise_replay_files(directory, workers=1) == scanned
+
+
+def test_corrupted_files_are_reported_on_every_run(tmp_path):
+    directory = str(tmp_path)
+    benchmark.generate_replays(directory, 10)
+
+    for file in ("corrupted.wbr", "corrupted.wbrb"):
+        with open(os.path.join(directory, file), "w") as f:
+            f.write("corrupted")
+
+    # The first run decodes the corrupted files and the second finds them in the index, whether it reads the headers or the whole games
+    for analyse in (wbat.summarise_replay_files, wbat.summarise_replay_files, wbat.load_player_statistics, wbat.load_player_statistics, wbat.summarise_replay_files):
+        report = wbat.IngestReport()
+        analyse(directory, workers=1, report=report)
+        assert report.failed == 2
+        assert sorted([file for files in report.failures.values() for file in files] + report.indexed) == ["corrupted.wbr", "corrupted.wbrb"]
+
+    os.remove(os.path.join(directory, "corrupted.wbr"))
+    report = wbat.IngestReport()
+    wbat.summarise_replay_files(directory, workers=1, report=report)
+    assert report.indexed == ["corrupted.wbrb"]
+
+
+def test_pack_refuses_the_folder_being_packed(tmp_path):
+    directory = str(tmp_path / "Replays")
+    benchmark.generate_replays(directory, 10)
+
+    with pytest.raises(ValueError):
+        wbat.pack_replay_archive(directory, os.path.join(directory, "replays.wbra"))
+
+    assert wbat.pack_replay_archive(directory, str(tmp_path / "replays.wbra")) == 10
+    assert len(wbat.list_replay_files(directory)) == 10
+
+
+def test_word_strengths_flag_invalid_characters():
+    words = ["CAT", "CaT", "", "C-T", "É", "\U0001f600Q"]
+    strengths, invalid = wbat.calculate_word_strengths(words)
+    assert strengths.tolist() == [13, 10, 0, 10, 0, 10]
+    assert invalid.tolist() == [False, True, False, True, True, True]
+    assert [wbat.calculate_word_strength(word) for word in words] == strengths.tolist()
+
+    statistics = wbat.PlayerStatistics()
+    statistics.add_replay("game.wbr", wbat.Replay(1, 3, None, [wbat.Turn("Alice", "human", None, "PLAYING", "CAT", [(0, 0), (0, 1), (0, 2)]),
+                                                               wbat.Turn("Alice", "human", None, "WON", "CaT", [(1, 0), (1, 1), (1, 2)])]))
+    player, = statistics.statistics()
+    assert (player["avg_word_strength"], player["invalid_words"]) == (11, 1)
+
+
+def test_replay_engine_seek_matches_sequential_play():
+    rng = random.Random(3)
+
+    for replay in generate_games(6, seed=3):
+        # Without snapshots every frame is reached by placing the words one after another from the empty board
+        engine = wbat.ReplayEngine(replay, len(replay.turns) + 1)
+        frames = []
+
+        for turn in range(len(replay.turns) + 1):
+            engine.seek(turn)
+            frames.append(engine.render())
+
+        for interval in (1, 3, wbat.REPLAY_SNAPSHOT_INTERVAL):
+            engine = wbat.ReplayEngine(replay, interval)
+
+            for _ in range(100):
+                turn = rng.choice([rng.randint(-2, len(frames) + 1), engine.turn + 1, engine.turn - 1, engine.turn + wbat.REPLAY_SKIP_TURNS, engine.turn - wbat.REPLAY_SKIP_TURNS])
+                engine.seek(turn)
+                assert engine.render() == frames[max(0, min(turn, len(frames) - 1))]